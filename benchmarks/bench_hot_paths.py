@@ -0,0 +1,138 @@
+"""Benchmarks of the Gobzigh sensor, switch and coordinator hot paths.
+
+Run from the repository root:
+
+    pip install -r benchmarks/requirements.txt
+    pytest -c benchmarks/pytest.ini benchmarks --benchmark-autosave
+    pytest -c benchmarks/pytest.ini benchmarks --benchmark-compare --benchmark-compare-fail=median:10%
+"""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.gobzigh.metrics import GobzighDeviceMetrics
+from custom_components.gobzigh.sensor import (
+    SENSOR_DESCRIPTIONS,
+    GobzighSensorEntity,
+    _create_device_sensors,
+)
+from custom_components.gobzigh.switch import GobzighRelaySwitchEntity
+
+from conftest import FLEET_SIZES, make_fleet, run_in_loop
+
+ROUNDS = 20
+
+
+@pytest.fixture
+async def coordinator_with_data(coordinator):
+    """Return a coordinator holding one processed update of a 100 device fleet."""
+    data = await coordinator._async_update_data()
+    coordinator.data = data
+    coordinator._async_process_devices(data["device_data"])
+    return coordinator
+
+
+@pytest.mark.parametrize("coordinator", FLEET_SIZES, indirect=True)
+def bench_update_data(benchmark, hass, coordinator):
+    """Fetch and assemble an account refresh over the stubbed transport."""
+
+    def _refresh():
+        return run_in_loop(hass, coordinator._async_update_data())
+
+    # Without the response cache every round measures a full refresh
+    benchmark.pedantic(_refresh, setup=coordinator.hub.async_clear_cache, rounds=ROUNDS)
+
+
+@pytest.mark.parametrize("coordinator", FLEET_SIZES, indirect=True)
+def bench_process_devices(benchmark, coordinator):
+    """Derive metrics, deadband and trend state for every device of an update."""
+    device_data = {device["device_id"]: device for device in coordinator.transport.devices}
+    coordinator.data = {"device_data": device_data}
+
+    benchmark.pedantic(
+        coordinator._async_process_devices, args=(device_data,), rounds=ROUNDS
+    )
+
+
+@pytest.mark.parametrize("size", FLEET_SIZES)
+def bench_metrics_from_record(benchmark, size):
+    """Compute the shared per-device metrics record."""
+    fleet = make_fleet(size)
+
+    def _derive():
+        for record in fleet:
+            GobzighDeviceMetrics.from_record(record)
+
+    benchmark.pedantic(_derive, rounds=ROUNDS)
+
+
+@pytest.mark.parametrize("description", SENSOR_DESCRIPTIONS, ids=lambda d: d.key)
+def bench_native_value(benchmark, coordinator_with_data, description):
+    """Read the state of each sensor description across the fleet."""
+    entities = [
+        GobzighSensorEntity(coordinator_with_data, device_id, "Tank", description)
+        for device_id in coordinator_with_data.data["device_data"]
+    ]
+
+    def _read():
+        for entity in entities:
+            entity.native_value
+
+    benchmark(_read)
+
+
+def bench_extra_state_attributes(benchmark, coordinator_with_data):
+    """Read the shared attributes of the level sensor across the fleet."""
+    level = SENSOR_DESCRIPTIONS[0]
+    entities = [
+        GobzighSensorEntity(coordinator_with_data, device_id, "Tank", level)
+        for device_id in coordinator_with_data.data["device_data"]
+    ]
+
+    def _read():
+        for entity in entities:
+            entity.extra_state_attributes
+
+    benchmark(_read)
+
+
+def bench_device_info(benchmark, coordinator_with_data):
+    """Read the cached device info across the fleet."""
+    entities = [
+        GobzighSensorEntity(coordinator_with_data, device_id, "Tank", SENSOR_DESCRIPTIONS[0])
+        for device_id in coordinator_with_data.data["device_data"]
+    ]
+
+    def _read():
+        for entity in entities:
+            entity.device_info
+
+    benchmark(_read)
+
+
+def bench_switch_is_on(benchmark, coordinator_with_data):
+    """Read the relay state across the fleet."""
+    entities = [
+        GobzighRelaySwitchEntity(coordinator_with_data, device_id, "Tank")
+        for device_id in coordinator_with_data.data["device_data"]
+    ]
+
+    def _read():
+        for entity in entities:
+            entity.is_on
+
+    benchmark(_read)
+
+
+@pytest.mark.parametrize("coordinator", FLEET_SIZES, indirect=True)
+def bench_create_device_sensors(benchmark, coordinator):
+    """Build the sensor entities of a whole fleet."""
+    fleet = list(coordinator.transport.devices)
+
+    def _create():
+        for record in fleet:
+            _create_device_sensors(
+                coordinator, record["device_id"], record, record["model_name"]
+            )
+
+    benchmark.pedantic(_create, rounds=ROUNDS)
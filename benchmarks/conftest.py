@@ -0,0 +1,91 @@
+"""Fixtures for the Gobzigh hot path benchmarks."""
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+from typing import Any, Coroutine, Dict, List
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / "tools"))
+
+from custom_components.gobzigh.const import (  # noqa: E402
+    CONF_ADOPT_ALL,
+    CONF_USER_ID,
+    DEVICE_DETAIL_URL,
+    DOMAIN,
+    USER_DEVICE_LIST_URL,
+)
+from custom_components.gobzigh.coordinator import GobzighCoordinator  # noqa: E402
+from custom_components.gobzigh.transport import GobzighTransport  # noqa: E402
+from generate_fleet import SimulatedTank  # noqa: E402
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+USER_ID = "507f1f77bcf86cd799439011"
+FLEET_SIZES = [1, 100, 10_000]
+
+
+def make_fleet(size: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Return the device list of a synthetic fleet, the same for the same seed."""
+    rng = random.Random(seed)
+    return [SimulatedTank(rng, index, USER_ID).step(0.08, 12.0) for index in range(size)]
+
+
+class FleetTransport(GobzighTransport):
+    """Answer the account's list and detail requests from a fixed fleet."""
+
+    def __init__(self, devices: List[Dict[str, Any]]) -> None:
+        """Initialize the transport."""
+        self.devices = devices
+        self._responses: Dict[str, Any] = {f"{USER_DEVICE_LIST_URL}{USER_ID}": devices}
+        for device in devices:
+            self._responses[f"{DEVICE_DETAIL_URL}{device['device_id']}"] = [device]
+
+    async def async_request(
+        self, method: str, url: str, payload: Dict[str, Any] | None = None
+    ) -> Any:
+        """Return the canned response of a request."""
+        return self._responses.get(url)
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load the integration from custom_components."""
+    yield
+
+
+def run_in_loop(hass, coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine to completion on the test's event loop.
+
+    Benchmarks are synchronous, so the loop is idle while they run. Anything
+    bound to ``hass`` must still be created inside it, by the async fixtures.
+    """
+    if hass.loop.is_running():
+        raise RuntimeError("run_in_loop() can only be used from a synchronous benchmark")
+    return hass.loop.run_until_complete(coro)
+
+
+@pytest.fixture
+async def coordinator(hass, request) -> GobzighCoordinator:
+    """Build an account coordinator in hub mode over a synthetic fleet.
+
+    The fleet size is taken from indirect parametrization and defaults to 100.
+    """
+    size = getattr(request, "param", 100)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data={CONF_USER_ID: USER_ID},
+        options={CONF_ADOPT_ALL: True},
+    )
+    entry.add_to_hass(hass)
+    coordinator = GobzighCoordinator(hass, entry)
+    coordinator.transport = FleetTransport(make_fleet(size))
+    # Measure the coordinator rather than the shared limiter's waits
+    coordinator.hub.async_set_rate_limit(1e9, 1_000_000_000)
+    return coordinator
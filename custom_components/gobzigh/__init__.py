@@ -7,10 +7,15 @@ from typing import Any
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN, CONF_USER_ID
+from .const import ATTR_MODEL_NAME, DOMAIN, CONF_USER_ID
 from .coordinator import GobzighCoordinator
+from .history import async_unload_history
 from .http import async_setup_http_views
+from .services import async_setup_services
+from .webhook import async_setup_webhook, async_unload_webhook
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,6 +25,15 @@ PLATFORMS: list[Platform] = [
 ]
 
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Gobzigh services."""
+    async_setup_services(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Gobzigh from a config entry."""
     _LOGGER.debug("Setting up Gobzigh integration")
@@ -41,9 +55,34 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     
+    # Accounts poll from the shared, interleaved schedule, devices at a staggered offset
+    coordinator.async_start_polling()
+    
     # Start device discovery (only for main integration entry)
     if CONF_USER_ID in entry.data:
         await coordinator.async_start_discovery()
+        
+        # Accept pushed device updates alongside polling
+        await async_setup_webhook(hass, entry)
+    
+    # Option changes are applied in place rather than by reloading; registered
+    # last so the webhook ID written during setup does not trigger it
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    
+    return True
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate old config entries."""
+    _LOGGER.debug("Migrating Gobzigh entry %s from version %s", entry.entry_id, entry.version)
+    
+    if entry.version == 1:
+        new_data = {**entry.data}
+        # Device entries used to carry a full API snapshot; keep only identity
+        if "device_data" in new_data:
+            device_data = new_data.pop("device_data") or {}
+            new_data[ATTR_MODEL_NAME] = device_data.get(ATTR_MODEL_NAME, "")
+        hass.config_entries.async_update_entry(entry, data=new_data, version=2)
     
     return True
 
@@ -52,15 +91,17 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.debug("Unloading Gobzigh integration entry: %s", entry.entry_id)
     
-    # Check if this is the main integration entry (has user_id)
+    # Devices and entities stay registered; only removing the entry deletes them
     if CONF_USER_ID in entry.data:
-        _LOGGER.debug("Unloading main integration - cleaning up all devices")
-        await _async_cleanup_integration_devices(hass, entry)
+        async_unload_webhook(hass, entry)
     
     # Unload platforms
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         coordinator = hass.data[DOMAIN].pop(entry.entry_id)
         await coordinator.async_shutdown()
+        # The history store is shared, close it with the last entry
+        if not hass.data[DOMAIN]:
+            await async_unload_history(hass)
     
     return unload_ok
 
@@ -191,7 +232,7 @@ async def _async_cleanup_integration_devices(hass: HomeAssistant, main_entry: Co
             await hass.config_entries.async_remove(entry.entry_id)
 
 
-async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed data or options to the running coordinator."""
+    if coordinator := hass.data.get(DOMAIN, {}).get(entry.entry_id):
+        await coordinator.async_apply_options()
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping, Optional
 
 import aiohttp
 import voluptuous as vol
@@ -12,23 +12,118 @@ from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import config_validation as cv
 
 from .const import (
+    ATTR_MODEL_NAME,
+    CONF_ADOPT_ALL,
+    CONF_ADOPT_MODELS,
+    CONF_ADOPTED_DEVICES,
+    CONF_CONE_HEIGHT,
+    CONF_DEADBAND_ABS,
+    CONF_DEADBAND_PCT,
+    CONF_DEVICE_SETTINGS,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    CONF_REPLAY_SPEED,
+    CONF_SCAN_INTERVAL,
+    CONF_STRAPPING_TABLE,
+    CONF_TANK_SHAPE,
+    CONF_TRANSPORT,
+    CONF_TRANSPORT_FILE,
     CONF_USER_ID,
-    DEVICE_TYPES,
+    CONF_WEBHOOK_SECRET,
+    DEFAULT_DEADBAND_ABS,
+    DEFAULT_DEADBAND_PCT,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_REPLAY_SPEED,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TRANSPORT_FILE,
     DOMAIN,
+    MIN_RATE_LIMIT,
+    MIN_SCAN_INTERVAL,
+    PRIORITY_INTERACTIVE,
+    TANK_SHAPE_CONE_BOTTOM,
+    TANK_SHAPE_RECTANGULAR,
+    TANK_SHAPE_STRAPPING,
+    TANK_SHAPES,
+    TRANSPORT_HTTP,
+    TRANSPORTS,
     USER_DEVICE_LIST_URL,
 )
+from .hub import async_get_hub
+from .models import get_model, model_names
+from .tank import parse_strapping_table
+from .webhook import async_get_webhook_url
 
 _LOGGER = logging.getLogger(__name__)
 
 USER_SCHEMA = vol.Schema({
     vol.Required(CONF_USER_ID): cv.string,
+    vol.Optional(CONF_ADOPT_ALL, default=False): cv.boolean,
 })
 
 
+def _device_options_schema(options: Mapping[str, Any], model: Any) -> Dict[Any, Any]:
+    """Return the state write and tank fields of a device, filled from its settings."""
+    non_negative = vol.All(vol.Coerce(float), vol.Range(min=0))
+    schema: Dict[Any, Any] = {
+        vol.Required(
+            CONF_DEADBAND_ABS,
+            default=options.get(CONF_DEADBAND_ABS, DEFAULT_DEADBAND_ABS),
+        ): non_negative,
+        vol.Required(
+            CONF_DEADBAND_PCT,
+            default=options.get(CONF_DEADBAND_PCT, DEFAULT_DEADBAND_PCT),
+        ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+        vol.Required(
+            CONF_MIN_WRITE_INTERVAL,
+            default=options.get(CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL),
+        ): non_negative,
+        vol.Required(
+            CONF_HEARTBEAT_INTERVAL,
+            default=options.get(CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL),
+        ): vol.All(vol.Coerce(float), vol.Range(min=60)),
+    }
+
+    # Tank shape only matters for models that measure a tank
+    if model is not None and model.tank_geometry:
+        schema.update({
+            vol.Required(
+                CONF_TANK_SHAPE,
+                default=options.get(CONF_TANK_SHAPE, TANK_SHAPE_RECTANGULAR),
+            ): vol.In(TANK_SHAPES),
+            vol.Optional(
+                CONF_CONE_HEIGHT, default=options.get(CONF_CONE_HEIGHT, 0.0)
+            ): non_negative,
+            vol.Optional(
+                CONF_STRAPPING_TABLE,
+                description={"suggested_value": options.get(CONF_STRAPPING_TABLE, "")},
+            ): cv.string,
+        })
+    return schema
+
+
+def _validate_device_options(user_input: Dict[str, Any]) -> Dict[str, str]:
+    """Return the errors of a device's tank settings."""
+    errors: Dict[str, str] = {}
+    shape = user_input.get(CONF_TANK_SHAPE)
+    if shape == TANK_SHAPE_STRAPPING:
+        try:
+            parse_strapping_table(user_input.get(CONF_STRAPPING_TABLE, ""))
+        except ValueError:
+            errors[CONF_STRAPPING_TABLE] = "invalid_strapping_table"
+    elif shape == TANK_SHAPE_CONE_BOTTOM and user_input.get(CONF_CONE_HEIGHT, 0) <= 0:
+        errors[CONF_CONE_HEIGHT] = "invalid_cone_height"
+    return errors
+
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Gobzigh."""
 
-    VERSION = 1
+    VERSION = 2
 
     def __init__(self) -> None:
         """Initialize the config flow."""
@@ -60,6 +155,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         return self.async_create_entry(
                             title="Gobzigh",
                             data={CONF_USER_ID: user_id},
+                            options={CONF_ADOPT_ALL: user_input.get(CONF_ADOPT_ALL, False)},
                         )
                         
                 except Exception:  # pylint: disable=broad-except
@@ -85,12 +181,6 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         
         self._discovered_device = device_data
         
-        # Get device type info
-        model_name = device_data.get("model_name", "")
-        device_type_info = self._get_device_type_info(model_name)
-        
-        device_name = device_data.get("name", f"Gobzigh {model_name}")
-        
         return await self.async_step_discovery_confirm()
 
     async def async_step_discovery_confirm(
@@ -102,11 +192,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             device_id = device_data["device_id"]
             device_name = device_data.get("name", f"Gobzigh {device_data.get('model_name', '')}")
             
+            # Only identity is stored; live data comes from the coordinator
             return self.async_create_entry(
                 title=device_name,
                 data={
                     "device_id": device_id,
-                    "device_data": device_data,
+                    ATTR_MODEL_NAME: device_data.get(ATTR_MODEL_NAME, ""),
                 },
             )
 
@@ -115,13 +206,11 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         device_data = self._discovered_device
         model_name = device_data.get("model_name", "")
-        device_type_info = self._get_device_type_info(model_name)
+        model = get_model(model_name)
         device_name = device_data.get("name", f"Gobzigh {model_name}")
         
         # Get friendly device type name
-        device_type_name = "Unknown"
-        if device_type_info:
-            device_type_name = device_type_info.get("type_info", {}).get("device_type_name", "Unknown")
+        device_type_name = model.name if model else "Unknown"
         
         placeholders = {
             "device_name": device_name,
@@ -147,26 +236,21 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def _async_get_user_devices(self, user_id: str) -> list[Dict[str, Any]] | None:
         """Get devices for user ID."""
         url = f"{USER_DEVICE_LIST_URL}{user_id}"
+        hub = async_get_hub(self.hass)
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=30) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-                    return data if isinstance(data, list) else []
+            data = await hub.async_get_json(url, cache_ttl=0, priority=PRIORITY_INTERACTIVE)
         except aiohttp.ClientError as err:
             _LOGGER.error("Error fetching user devices: %s", err)
             return None
         except Exception as err:
             _LOGGER.error("Unexpected error: %s", err)
             return None
-
-    def _get_device_type_info(self, model_name: str) -> Dict[str, Any] | None:
-        """Get device type information from model name."""
-        for device_type in DEVICE_TYPES:
-            if device_type["device_type_code"] == model_name:
-                return device_type
-        return None
+        
+        devices = data if isinstance(data, list) else []
+        # Hand the validated list to the entry's first refresh
+        hub.async_seed_user_devices(user_id, devices)
+        return devices
 
     @staticmethod
     @callback
@@ -183,12 +267,111 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         """Initialize HACS options flow."""
         self.config_entry = config_entry
+        self._device_id: str | None = None
 
     async def async_step_init(
         self, user_input: Dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
-        return await self.async_step_user()
+        if "device_id" in self.config_entry.data:
+            return await self.async_step_device()
+        if not self._account_devices():
+            return await self.async_step_user()
+        return self.async_show_menu(
+            step_id="init", menu_options=["user", "select_device"]
+        )
+
+    async def async_step_device(
+        self, user_input: Dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the state write and tank settings of a device entry."""
+        errors: Dict[str, str] = {}
+
+        if user_input is not None:
+            errors = _validate_device_options(user_input)
+            if not errors:
+                return self.async_create_entry(
+                    title="", data={**self.config_entry.options, **user_input}
+                )
+
+        options = self.config_entry.options
+        schema = _device_options_schema(
+            options, get_model(self.config_entry.data.get(ATTR_MODEL_NAME))
+        )
+        schema[
+            vol.Required(
+                CONF_SCAN_INTERVAL,
+                default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+            )
+        ] = vol.All(vol.Coerce(int), vol.Range(min=MIN_SCAN_INTERVAL))
+
+        return self.async_show_form(
+            step_id="device",
+            data_schema=vol.Schema(schema),
+            errors=errors,
+        )
+
+    async def async_step_select_device(
+        self, user_input: Dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Pick a device of the account to change the settings of."""
+        devices = self._account_devices()
+        if user_input is not None:
+            self._device_id = user_input["device_id"]
+            return await self.async_step_device_settings()
+
+        return self.async_show_form(
+            step_id="select_device",
+            data_schema=vol.Schema({
+                vol.Required("device_id"): vol.In({
+                    device_id: f"{device.get('name', device_id)} ({device.get('model_name', '')})"
+                    for device_id, device in devices.items()
+                }),
+            }),
+        )
+
+    async def async_step_device_settings(
+        self, user_input: Dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the state write and tank settings of a device of the account."""
+        errors: Dict[str, str] = {}
+        device_settings = dict(self.config_entry.options.get(CONF_DEVICE_SETTINGS, {}))
+
+        if user_input is not None:
+            errors = _validate_device_options(user_input)
+            if not errors:
+                device_settings[self._device_id] = user_input
+                return self.async_create_entry(
+                    title="",
+                    data={
+                        **self.config_entry.options,
+                        CONF_DEVICE_SETTINGS: device_settings,
+                    },
+                )
+
+        device = self._account_devices().get(self._device_id, {})
+        return self.async_show_form(
+            step_id="device_settings",
+            data_schema=vol.Schema(
+                _device_options_schema(
+                    device_settings.get(self._device_id, {}),
+                    get_model(device.get(ATTR_MODEL_NAME)),
+                )
+            ),
+            description_placeholders={"device_name": device.get("name", self._device_id)},
+            errors=errors,
+        )
+
+    def _account_devices(self) -> Dict[str, Dict[str, Any]]:
+        """Return the devices currently listed on the account, by device ID."""
+        coordinator = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        if not coordinator or not coordinator.data:
+            return {}
+        return {
+            device["device_id"]: device
+            for device in coordinator.data.get("user_devices", [])
+            if device.get("device_id")
+        }
 
     async def async_step_user(
         self, user_input: Dict[str, Any] | None = None
@@ -203,19 +386,99 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             if len(user_id) != 24:
                 errors[CONF_USER_ID] = "invalid_user_id_length"
             else:
-                # Update config entry
+                options = {
+                    **self.config_entry.options,
+                    CONF_SCAN_INTERVAL: user_input.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                    CONF_WEBHOOK_SECRET: user_input.get(CONF_WEBHOOK_SECRET, ""),
+                    CONF_ADOPT_ALL: user_input.get(CONF_ADOPT_ALL, False),
+                    CONF_ADOPT_MODELS: user_input.get(CONF_ADOPT_MODELS, []),
+                    CONF_ADOPTED_DEVICES: user_input.get(CONF_ADOPTED_DEVICES, []),
+                    **{
+                        key: user_input[key]
+                        for key in (
+                            CONF_TRANSPORT,
+                            CONF_TRANSPORT_FILE,
+                            CONF_REPLAY_SPEED,
+                            CONF_RATE_LIMIT,
+                            CONF_RATE_BURST,
+                        )
+                        if key in user_input
+                    },
+                }
+                # Data and options change together, so listeners run once;
+                # finishing the flow with the same options is then a no-op
                 self.hass.config_entries.async_update_entry(
                     self.config_entry,
-                    data={**self.config_entry.data, CONF_USER_ID: user_id}
+                    data={**self.config_entry.data, CONF_USER_ID: user_id},
+                    options=options,
                 )
-                return self.async_create_entry(title="", data={})
+                return self.async_create_entry(title="", data=options)
 
+        options = self.config_entry.options
         current_user_id = self.config_entry.data.get(CONF_USER_ID, "")
+        current_secret = options.get(CONF_WEBHOOK_SECRET, "")
+        webhook_url = async_get_webhook_url(self.hass, self.config_entry)
+        
+        # Offer the devices currently listed on the account for adoption
+        known_devices = {
+            device_id: f"{device.get('name', device_id)} ({device.get('model_name', '')})"
+            for device_id, device in self._account_devices().items()
+        }
+        model_codes = model_names()
+        
+        schema: Dict[Any, Any] = {
+            vol.Required(CONF_USER_ID, default=current_user_id): cv.string,
+            vol.Required(
+                CONF_SCAN_INTERVAL,
+                default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=MIN_SCAN_INTERVAL)),
+            vol.Optional(
+                CONF_WEBHOOK_SECRET,
+                description={"suggested_value": current_secret},
+            ): cv.string,
+            vol.Optional(
+                CONF_ADOPT_ALL, default=options.get(CONF_ADOPT_ALL, False)
+            ): cv.boolean,
+            vol.Optional(
+                CONF_ADOPT_MODELS, default=options.get(CONF_ADOPT_MODELS, [])
+            ): cv.multi_select(model_codes),
+            vol.Optional(
+                CONF_ADOPTED_DEVICES,
+                default=[
+                    device_id
+                    for device_id in options.get(CONF_ADOPTED_DEVICES, [])
+                    if device_id in known_devices
+                ],
+            ): cv.multi_select(known_devices),
+        }
+        
+        # Request rate and capture/replay of API traffic are for troubleshooting
+        if self.show_advanced_options:
+            schema.update({
+                vol.Optional(
+                    CONF_RATE_LIMIT,
+                    default=options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+                ): vol.All(vol.Coerce(float), vol.Range(min=MIN_RATE_LIMIT)),
+                vol.Optional(
+                    CONF_RATE_BURST,
+                    default=options.get(CONF_RATE_BURST, DEFAULT_RATE_BURST),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    CONF_TRANSPORT, default=options.get(CONF_TRANSPORT, TRANSPORT_HTTP)
+                ): vol.In(TRANSPORTS),
+                vol.Optional(
+                    CONF_TRANSPORT_FILE,
+                    default=options.get(CONF_TRANSPORT_FILE, DEFAULT_TRANSPORT_FILE),
+                ): cv.string,
+                vol.Optional(
+                    CONF_REPLAY_SPEED,
+                    default=options.get(CONF_REPLAY_SPEED, DEFAULT_REPLAY_SPEED),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            })
         
         return self.async_show_form(
             step_id="user",
-            data_schema=vol.Schema({
-                vol.Required(CONF_USER_ID, default=current_user_id): cv.string,
-            }),
+            data_schema=vol.Schema(schema),
+            description_placeholders={"webhook_url": webhook_url or "-"},
             errors=errors,
         )
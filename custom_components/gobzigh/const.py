@@ -15,7 +15,25 @@ DEVICE_TYPES: Final = [
             "device_type_name": "Liquid Level",
             "device_generation": "V0"
         },
-        "docs_url": "https://github.com/RASBR/home-assistant-gobzigh/wiki/liquid-level-sensor"
+        "docs_url": "https://github.com/RASBR/home-assistant-gobzigh/wiki/liquid-level-sensor",
+        "sensors": [
+            "level",
+            "tank_height",
+            "tank_width",
+            "tank_length",
+            "sensor_distance",
+            "water_height",
+            "current_volume",
+            "max_volume",
+            "percentage",
+            "connection",
+            "fill_rate",
+            "smoothed_water_height",
+            "time_to_empty",
+            "time_to_full",
+        ],
+        "relay": True,
+        "tank_geometry": True,
     },
     {
         "device_type_code": "OTHV0", 
@@ -23,21 +41,134 @@ DEVICE_TYPES: Final = [
             "device_type_name": "Other",
             "device_generation": "V0"
         },
-        "docs_url": "https://github.com/RASBR/home-assistant-gobzigh/wiki/other-devices"
+        "docs_url": "https://github.com/RASBR/home-assistant-gobzigh/wiki/other-devices",
+        "sensors": ["connection"],
+        "relay": False,
+        "tank_geometry": False,
     },
 ]
 
 # Configuration Keys
 CONF_USER_ID: Final = "user_id"
+CONF_SCAN_INTERVAL: Final = "scan_interval"
+CONF_WEBHOOK_ID: Final = "webhook_id"
+CONF_WEBHOOK_SECRET: Final = "webhook_secret"
+CONF_ADOPT_ALL: Final = "adopt_all"
+CONF_ADOPT_MODELS: Final = "adopt_models"
+CONF_ADOPTED_DEVICES: Final = "adopted_devices"
+CONF_DEADBAND_ABS: Final = "deadband_abs"
+CONF_DEADBAND_PCT: Final = "deadband_pct"
+CONF_MIN_WRITE_INTERVAL: Final = "min_write_interval"
+CONF_HEARTBEAT_INTERVAL: Final = "heartbeat_interval"
+CONF_TANK_SHAPE: Final = "tank_shape"
+CONF_CONE_HEIGHT: Final = "cone_height"
+CONF_STRAPPING_TABLE: Final = "strapping_table"
+CONF_DEVICE_SETTINGS: Final = "device_settings"  # account entries: device_id -> settings
+CONF_TRANSPORT: Final = "transport"
+CONF_TRANSPORT_FILE: Final = "transport_file"
+CONF_REPLAY_SPEED: Final = "replay_speed"
+CONF_RATE_LIMIT: Final = "rate_limit"
+CONF_RATE_BURST: Final = "rate_burst"
+
+# Push Webhook
+WEBHOOK_SIGNATURE_HEADER: Final = "X-Gobzigh-Signature"
+WEBHOOK_TIMESTAMP_HEADER: Final = "X-Gobzigh-Timestamp"
+WEBHOOK_MAX_AGE: Final = 300  # seconds a signed push stays valid
+WEBHOOK_EXECUTOR_THRESHOLD: Final = 256 * 1024  # bytes, decode larger bodies off the loop
+WEBHOOK_MERGE_CHUNK: Final = 500  # records merged between event loop yields
+
+# Executor Offload for Large Accounts
+PAYLOAD_EXECUTOR_THRESHOLD: Final = 256 * 1024  # bytes, decode the rest of larger bodies off the loop
+FLEET_EXECUTOR_THRESHOLD: Final = 500  # devices, derive metrics of larger updates off the loop
 
 # Update Intervals
 DEFAULT_SCAN_INTERVAL: Final = 290  # seconds
+MIN_SCAN_INTERVAL: Final = 30  # seconds
+STARTUP_RAMP_WINDOW: Final = 5  # seconds over which device entries starting together first fetch
+
+# Shared API Access
+API_TIMEOUT: Final = 30  # seconds
+MAX_CONCURRENT_REQUESTS: Final = 4
+RESPONSE_CACHE_TTL: Final = 10  # seconds a response is reused for the same URL
+SEED_CACHE_TTL: Final = 120  # seconds validated/listed records seed the next fetches
+CACHE_SWEEP_INTERVAL: Final = 60  # seconds between sweeps of expired responses
+PRIORITY_COMMAND: Final = 0  # relay commands, served first
+PRIORITY_INTERACTIVE: Final = 1  # user-initiated requests
+PRIORITY_BACKGROUND: Final = 2  # scheduled polling
+DEFAULT_RATE_LIMIT: Final = 2.0  # requests per second across all entries
+DEFAULT_RATE_BURST: Final = 10  # requests allowed back to back
+MIN_RATE_LIMIT: Final = 0.1  # requests per second
+
+# Transports (capture and replay are for reproducing load offline)
+TRANSPORT_HTTP: Final = "http"
+TRANSPORT_CAPTURE: Final = "capture"
+TRANSPORT_REPLAY: Final = "replay"
+TRANSPORTS: Final = [TRANSPORT_HTTP, TRANSPORT_CAPTURE, TRANSPORT_REPLAY]
+DEFAULT_TRANSPORT_FILE: Final = "gobzigh_capture.jsonl"  # relative to the config directory
+DEFAULT_REPLAY_SPEED: Final = 1.0  # 0 replays without waiting
+
+# Services
+SERVICE_REFRESH: Final = "refresh"
+SERVICE_HISTORY: Final = "history"
+
+# Local Level History
+HISTORY_FILE: Final = "gobzigh_history.db"  # relative to the config directory
+HISTORY_METRICS: Final = ("water_height", "current_volume", "percentage")
+HISTORY_RESOLUTION_MINUTE: Final = 60  # seconds
+HISTORY_RESOLUTION_HOUR: Final = 3600
+HISTORY_RESOLUTION_DAY: Final = 86400
+HISTORY_RESOLUTIONS: Final = (
+    HISTORY_RESOLUTION_MINUTE,
+    HISTORY_RESOLUTION_HOUR,
+    HISTORY_RESOLUTION_DAY,
+)
+HISTORY_RETENTION: Final = {  # seconds each resolution is kept
+    HISTORY_RESOLUTION_MINUTE: 7 * 86400,
+    HISTORY_RESOLUTION_HOUR: 365 * 86400,
+    HISTORY_RESOLUTION_DAY: 10 * 365 * 86400,
+}
+HISTORY_FLUSH_INTERVAL: Final = 60  # seconds between batched writes
+HISTORY_BATCH_SIZE: Final = 5000  # buffered samples that trigger an early write
+HISTORY_MIN_SPACING: Final = 15  # seconds, closer samples of a device are dropped
+HISTORY_MAX_POINTS: Final = 500  # points per series when the resolution is automatic
+
+# State Write Suppression (defaults write every reading)
+DEFAULT_DEADBAND_ABS: Final = 0.0  # cm
+DEFAULT_DEADBAND_PCT: Final = 0.0  # % of tank height
+DEFAULT_MIN_WRITE_INTERVAL: Final = 0  # seconds
+DEFAULT_HEARTBEAT_INTERVAL: Final = 3600  # seconds
+
+# Fill/Drain Trend
+TREND_WINDOW_SIZE: Final = 16  # samples kept per device
+TREND_SMOOTHING: Final = 0.3  # EMA factor for the smoothed level
+TREND_MIN_SPAN: Final = 600  # seconds of samples needed before reporting a rate
+TREND_RATE_EPSILON: Final = 0.001  # m/h below which the level is considered steady
+
+# Tank Shapes
+TANK_SHAPE_RECTANGULAR: Final = "rectangular"
+TANK_SHAPE_VERTICAL_CYLINDER: Final = "vertical_cylinder"
+TANK_SHAPE_HORIZONTAL_CYLINDER: Final = "horizontal_cylinder"
+TANK_SHAPE_CONE_BOTTOM: Final = "cone_bottom"
+TANK_SHAPE_STRAPPING: Final = "strapping"
+TANK_SHAPES: Final = [
+    TANK_SHAPE_RECTANGULAR,
+    TANK_SHAPE_VERTICAL_CYLINDER,
+    TANK_SHAPE_HORIZONTAL_CYLINDER,
+    TANK_SHAPE_CONE_BOTTOM,
+    TANK_SHAPE_STRAPPING,
+]
+TANK_TABLE_POINTS: Final = 64  # samples of a curved tank's level to volume table
 
 # Device Classes and Units
 UNIT_PERCENTAGE: Final = "%"
 UNIT_METERS: Final = "m"
+UNIT_METERS_PER_HOUR: Final = "m/h"
 UNIT_CUBIC_METERS: Final = "m³"
 UNIT_CENTIMETERS: Final = "cm"
+UNIT_LITERS: Final = "L"
+
+# Consumption totals reported by the API are in liters
+CONSUMPTION_UNIT: Final = UNIT_LITERS
 
 # Entity Keys
 ATTR_RELAY_STATE: Final = "relay_state"
@@ -0,0 +1,137 @@
+"""Long-term consumption statistics for Gobzigh devices."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import ATTR_CONSUMPTION, CONSUMPTION_UNIT, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def consumption_statistic_id(device_id: str) -> str:
+    """Return the external statistic id used for a device's consumption."""
+    return f"{DOMAIN}:consumption_{slugify(device_id)}"
+
+
+class GobzighConsumptionStatistics:
+    """Import device consumption into the recorder as external statistics.
+
+    The API only reports running totals for the current day, week and month.
+    The day total is turned into an hourly cumulative ``sum`` (with a reset
+    each time the day total drops), which is what the Energy and Water
+    dashboards consume; week and month views are derived from it by the
+    recorder. Each device contributes at most one row per hour.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the importer."""
+        self.hass = hass
+        self._lock = asyncio.Lock()
+        # device_id -> (running sum, last day total)
+        self._totals: Dict[str, Tuple[float, float]] = {}
+        # device_id -> (hour start, day total) of the last imported row
+        self._imported: Dict[str, Tuple[datetime, float]] = {}
+
+    async def async_import(self, devices: List[Dict[str, Any]]) -> None:
+        """Import one cycle of consumption totals for the whole fleet."""
+        if "recorder" not in self.hass.config.components:
+            return
+
+        async with self._lock:
+            try:
+                await self._async_import(devices)
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.warning("Failed to import consumption statistics: %s", err)
+
+    async def _async_import(self, devices: List[Dict[str, Any]]) -> None:
+        """Build and submit the statistics rows for changed devices."""
+        hour_start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+
+        # Devices that left the account no longer need their running sums
+        listed = {device.get("device_id") for device in devices}
+        for state in (self._totals, self._imported):
+            for device_id in [device_id for device_id in state if device_id not in listed]:
+                del state[device_id]
+
+        readings: Dict[str, float] = {}
+        names: Dict[str, str] = {}
+        for device in devices:
+            device_id = device.get("device_id")
+            consumption = device.get(ATTR_CONSUMPTION)
+            if not device_id or not isinstance(consumption, dict):
+                continue
+            day_total = consumption.get("day")
+            if not isinstance(day_total, (int, float)):
+                continue
+            # De-duplicate by period: skip devices whose row for this hour is unchanged
+            if self._imported.get(device_id) == (hour_start, float(day_total)):
+                continue
+            readings[device_id] = float(day_total)
+            names[device_id] = device.get("name") or device_id
+
+        if not readings:
+            return
+
+        # Resume running sums from the recorder for devices seen for the first time
+        unknown = [device_id for device_id in readings if device_id not in self._totals]
+        if unknown:
+            self._totals.update(
+                await get_instance(self.hass).async_add_executor_job(
+                    self._load_last_totals, unknown
+                )
+            )
+
+        for device_id, day_total in readings.items():
+            running_sum, last_day_total = self._totals.get(device_id, (0.0, 0.0))
+            # The API resets the day on its own clock, not at local midnight,
+            # so only a drop in the total starts a new day
+            if day_total < last_day_total:
+                running_sum += day_total
+            else:
+                running_sum += day_total - last_day_total
+            self._totals[device_id] = (running_sum, day_total)
+            self._imported[device_id] = (hour_start, day_total)
+
+            metadata = StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=f"{names[device_id]} Consumption",
+                source=DOMAIN,
+                statistic_id=consumption_statistic_id(device_id),
+                unit_of_measurement=CONSUMPTION_UNIT,
+            )
+            async_add_external_statistics(
+                self.hass,
+                metadata,
+                [StatisticData(start=hour_start, state=day_total, sum=running_sum)],
+            )
+
+        _LOGGER.debug("Imported consumption statistics for %d devices", len(readings))
+
+    def _load_last_totals(
+        self, device_ids: List[str]
+    ) -> Dict[str, Tuple[float, float]]:
+        """Read the last imported sum for each device (runs in the recorder executor)."""
+        totals: Dict[str, Tuple[float, float]] = {}
+        for device_id in device_ids:
+            statistic_id = consumption_statistic_id(device_id)
+            last = get_last_statistics(
+                self.hass, 1, statistic_id, True, {"state", "sum"}
+            ).get(statistic_id)
+            if not last:
+                continue
+            row = last[0]
+            totals[device_id] = (row.get("sum") or 0.0, row.get("state") or 0.0)
+        return totals
@@ -3,27 +3,96 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import timedelta
-from typing import Any, Dict, List
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Mapping
 
 import aiohttp
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.helpers import discovery_flow
+from homeassistant.helpers import discovery_flow, issue_registry as ir
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.device_registry import DeviceInfo
 
 from .const import (
+    ATTR_CONNECTION_STATUS,
+    ATTR_CONSUMPTION,
+    ATTR_FIRMWARE_VERSION,
+    ATTR_MODEL_NAME,
+    ATTR_NEXT_FIRMWARE,
+    ATTR_RELAY_STATE,
+    ATTR_ROOM_NAME,
+    ATTR_SETTINGS,
+    CONF_ADOPT_ALL,
+    CONF_ADOPT_MODELS,
+    CONF_ADOPTED_DEVICES,
+    CONF_DEVICE_SETTINGS,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    CONF_REPLAY_SPEED,
+    CONF_SCAN_INTERVAL,
+    CONF_TRANSPORT,
+    CONF_TRANSPORT_FILE,
     CONF_USER_ID,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
     DEFAULT_SCAN_INTERVAL,
     DEVICE_DETAIL_URL,
-    DEVICE_TYPES,
     DOMAIN,
+    FLEET_EXECUTOR_THRESHOLD,
+    SEED_CACHE_TTL,
     USER_DEVICE_LIST_URL,
+    WEBHOOK_MERGE_CHUNK,
 )
+from .consumption import GobzighConsumptionStatistics
+from .device import GobzighDeviceManager
+from .history import async_get_history
+from .hub import async_get_hub
+from .metrics import GobzighDeviceMetrics
+from .models import get_model
+from .tank import CompiledTank, TankShapeConfig
+from .throttle import LevelWriteConfig, LevelWriteGate
+from .transport import async_create_transport
+from .trend import LevelTrend
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _valid_records(devices: List[Any]) -> List[Dict[str, Any]]:
+    """Return the device records of a list response that carry a device ID."""
+    return [
+        device for device in devices if isinstance(device, dict) and device.get("device_id")
+    ]
+
+
+def _device_metrics(record: Dict[str, Any], tank: CompiledTank) -> GobzighDeviceMetrics:
+    """Derive a device's metrics for its model."""
+    model = get_model(record.get(ATTR_MODEL_NAME))
+    return GobzighDeviceMetrics.from_record(
+        record, tank_geometry=model is None or model.tank_geometry, tank=tank
+    )
+
+
+def _derive_metrics(
+    device_data: Dict[str, Dict[str, Any]], tanks: Dict[str, CompiledTank]
+) -> Dict[str, GobzighDeviceMetrics]:
+    """Derive the metrics of every device (runs in the executor)."""
+    return {
+        device_id: _device_metrics(record, tanks[device_id])
+        for device_id, record in device_data.items()
+    }
+
+
+def _transport_options(options: Mapping[str, Any]) -> tuple[Any, ...]:
+    """Return the options that select an account's transport."""
+    return (
+        options.get(CONF_TRANSPORT),
+        options.get(CONF_TRANSPORT_FILE),
+        options.get(CONF_REPLAY_SPEED),
+    )
+
+
 class GobzighCoordinator(DataUpdateCoordinator):
     """Gobzigh data coordinator."""
 
@@ -33,35 +102,177 @@ class GobzighCoordinator(DataUpdateCoordinator):
         # Handle both main entry (has user_id) and device entries (has device_id)
         self.user_id = entry.data.get(CONF_USER_ID)
         self.device_id = entry.data.get("device_id")
-        self._session: aiohttp.ClientSession | None = None
-        self._discovered_devices: Dict[str, Dict[str, Any]] = {}
+        self.hub = async_get_hub(hass)
+        self.transport = async_create_transport(hass, self.hub.transport, entry.options)
+        self._transport_options = _transport_options(entry.options)
+        # Only the name is kept for discovered devices, the record lives in data
+        self._discovered_devices: Dict[str, str] = {}
         self._added_devices: set[str] = set()
+        # Devices onboarded directly under this account entry (hub mode)
+        self.adopted_devices: set[str] = set()
+        self._device_listeners: Dict[str, list[Callable[[], None]]] = {}
+        self._consumption = GobzighConsumptionStatistics(hass)
+        self._history = async_get_history(hass)
+        self._level_gates: Dict[str, LevelWriteGate] = {}
+        self._trends: Dict[str, LevelTrend] = {}
+        self._metrics: Dict[str, GobzighDeviceMetrics] = {}
+        # Settings and compiled volume table of each device, rebuilt on option changes
+        self._tanks: Dict[str, CompiledTank] = {}
+        self._write_configs: Dict[str, LevelWriteConfig] = {}
+        self._attributes: Dict[str, Dict[str, Any]] = {}
+        self._device_manager = GobzighDeviceManager(hass)
+        self._device_info: Dict[str, DeviceInfo] = {}
+        self._processed_data: Dict[str, Any] | None = None
+        # Set when changed options require the held data to be re-derived
+        self._reprocess = False
+        self._fetch_task: asyncio.Task[Dict[str, Any]] | None = None
+        # Index of the account list that pushes merge into
+        self._indexed_devices: List[Dict[str, Any]] | None = None
+        self._positions: Dict[str, int] = {}
+        # Metrics of a large update derived in the executor, consumed once
+        self._precomputed: Dict[str, GobzighDeviceMetrics] = {}
+        # Where the last large update spent its time, in milliseconds
+        self.timings: Dict[str, float] = {}
         
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            # Accounts are interleaved by the hub, device entries keep a staggered timer
+            update_interval=None,
         )
+        self._unsub_poll: CALLBACK_TYPE | None = None
+
+    @property
+    def scan_interval(self) -> float:
+        """Return the configured seconds between polls."""
+        return float(self.entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
+
+    @property
+    def rate_limit(self) -> float:
+        """Return the configured API requests per second."""
+        return float(self.entry.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT))
+
+    @property
+    def rate_burst(self) -> int:
+        """Return the configured number of back-to-back API requests."""
+        return int(self.entry.options.get(CONF_RATE_BURST, DEFAULT_RATE_BURST))
+
+    async def async_apply_options(self) -> None:
+        """Apply changed entry data and options in place.
+
+        Entities, the shared session and the poll schedule stay up. A new
+        user ID or transport cancels the poll in flight and refetches;
+        interval changes reschedule; deadband and tank settings are
+        re-derived from the data already held.
+        """
+        refetch = False
+        user_id = self.entry.data.get(CONF_USER_ID)
+        if user_id != self.user_id:
+            _LOGGER.debug("Gobzigh account changed from %s to %s", self.user_id, user_id)
+            self.user_id = user_id
+            # The previous account's devices were not removed, just left behind
+            self._discovered_devices.clear()
+            refetch = True
+
+        transport_options = _transport_options(self.entry.options)
+        new_transport = transport_options != self._transport_options
+        refetch = refetch or new_transport
+
+        if refetch:
+            self.async_cancel_refresh()
+        if new_transport:
+            previous = self.transport
+            self._transport_options = transport_options
+            self.transport = async_create_transport(
+                self.hass, self.hub.transport, self.entry.options
+            )
+            await previous.async_close()
+
+        if self.user_id:
+            self.hub.async_update_account(self)
+        elif self._unsub_poll:
+            self._async_schedule_device_poll()
+
+        # Re-derive metrics and write gates with the new settings
+        self._tanks.clear()
+        self._write_configs.clear()
+        self._reprocess = True
+        if self.data is not None:
+            self.async_update_listeners()
+
+        if refetch:
+            await self.async_request_refresh()
+
+    @callback
+    def async_cancel_refresh(self) -> None:
+        """Cancel the fetch in flight, whoever started the refresh."""
+        if task := self._fetch_task:
+            self._fetch_task = None
+            task.cancel()
 
     async def _async_update_data(self) -> Dict[str, Any]:
+        """Fetch data as a task that changed options can cancel.
+
+        A cancelled fetch keeps the data already held; the refresh that
+        follows the change fetches it again.
+        """
+        task = self._fetch_task = self.hass.async_create_task(
+            self._async_fetch_data(), f"{DOMAIN} fetch {self.entry.entry_id}"
+        )
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if self._fetch_task is task:
+                # The refresh itself was cancelled, not only its fetch
+                raise
+            if self.data is None:
+                raise UpdateFailed("Refresh cancelled before any data was fetched")
+            _LOGGER.debug("Cancelled the fetch of %s, keeping the data held", self.name)
+            return self.data
+        finally:
+            if self._fetch_task is task:
+                self._fetch_task = None
+
+    async def _async_fetch_data(self) -> Dict[str, Any]:
         """Fetch data from Gobzigh API."""
-        if not self._session:
-            self._session = aiohttp.ClientSession()
-        
+        self._precomputed = {}
         try:
             device_data = {}
             
             # If this is a device-specific coordinator, only fetch that device's data
+            # Entities are built from this record, so a missing one fails the update
+            # (and retries setup) rather than passing as a device without data
             if self.device_id:
                 detail_data = await self._fetch_device_detail(self.device_id)
-                if detail_data:
-                    device_data[self.device_id] = detail_data[0]  # API returns list
+                if detail_data is None:
+                    raise UpdateFailed(f"Error fetching device {self.device_id}")
+                if not detail_data:
+                    raise UpdateFailed(f"Device {self.device_id} was not returned by the API")
+                device_data[self.device_id] = detail_data[0]  # API returns list
                 return {"device_data": device_data}
             
             # If this is the main coordinator with user_id, get user devices
             if self.user_id:
-                user_devices = await self._fetch_user_devices()
+                user_devices = _valid_records(await self._fetch_user_devices())
+                
+                # Device entries read their record from this list instead of refetching,
+                # so each device is held once however many coordinators watch it
+                self.hub.async_seed_device_records(user_devices, ttl=self._seed_ttl())
+                
+                # Feed consumption totals to long-term statistics in one batch
+                self.hass.async_create_task(
+                    self._consumption.async_import(user_devices)
+                )
+                
+                # Adopted devices are served straight from the account list
+                adopted = self._adopted_device_ids(user_devices)
+                for device in user_devices:
+                    if device.get("device_id") in adopted:
+                        device_data[device["device_id"]] = device
+                if adopted - self.adopted_devices:
+                    self._async_abort_adopted_flows(adopted - self.adopted_devices)
+                self.adopted_devices = adopted
                 
                 # Get detailed data for added devices
                 for device_id in self._added_devices:
@@ -74,6 +285,18 @@ class GobzighCoordinator(DataUpdateCoordinator):
                             "Failed to fetch device %s data: %s", device_id, err
                         )
                 
+                # Derive the metrics of large fleets off the event loop
+                if len(device_data) > FLEET_EXECUTOR_THRESHOLD:
+                    started = time.perf_counter()
+                    self._precomputed = await self.hass.async_add_executor_job(
+                        _derive_metrics,
+                        device_data,
+                        {device_id: self._device_tank(device_id) for device_id in device_data},
+                    )
+                    self.timings["metrics_executor_ms"] = round(
+                        (time.perf_counter() - started) * 1000, 1
+                    )
+                
                 return {
                     "user_devices": user_devices,
                     "device_data": device_data,
@@ -81,9 +304,62 @@ class GobzighCoordinator(DataUpdateCoordinator):
             
             return {"device_data": {}}
             
+        except UpdateFailed:
+            raise
         except Exception as err:
             raise UpdateFailed(f"Error communicating with Gobzigh API: {err}") from err
 
+    def _seed_ttl(self) -> float:
+        """Return how long listed records may answer device entries' fetches.
+
+        Never longer than the shortest device entry interval, so a device
+        polled more often than its account still gets a fresh record.
+        """
+        return min(
+            [
+                SEED_CACHE_TTL,
+                *(
+                    coordinator.scan_interval
+                    for coordinator in self.hass.data.get(DOMAIN, {}).values()
+                    if coordinator.device_id
+                ),
+            ]
+        )
+
+    def _adopted_device_ids(self, user_devices: List[Dict[str, Any]]) -> set[str]:
+        """Return the devices adopted under this account entry."""
+        options = self.entry.options
+        adopt_all = options.get(CONF_ADOPT_ALL, False)
+        selected = set(options.get(CONF_ADOPTED_DEVICES, []))
+        models = set(options.get(CONF_ADOPT_MODELS, []))
+        if not adopt_all and not selected:
+            return set()
+
+        # Devices with their own config entry keep it
+        own_entries = {
+            entry.data["device_id"]
+            for entry in self.hass.config_entries.async_entries(DOMAIN)
+            if "device_id" in entry.data
+        }
+        adopted: set[str] = set()
+        for device in user_devices:
+            device_id = device.get("device_id")
+            if not device_id or device_id in own_entries:
+                continue
+            if device_id in selected or (
+                adopt_all and (not models or device.get("model_name") in models)
+            ):
+                adopted.add(device_id)
+        return adopted
+
+    @callback
+    def _async_abort_adopted_flows(self, device_ids: set[str]) -> None:
+        """Abort pending discovery flows of devices that were just adopted."""
+        flow_manager = self.hass.config_entries.flow
+        for flow in flow_manager.async_progress_by_handler(DOMAIN):
+            if flow["context"].get("unique_id") in device_ids:
+                flow_manager.async_abort(flow["flow_id"])
+
     async def _fetch_user_devices(self) -> List[Dict[str, Any]]:
         """Fetch all devices for the user."""
         if not self.user_id:
@@ -91,50 +367,58 @@ class GobzighCoordinator(DataUpdateCoordinator):
             
         url = f"{USER_DEVICE_LIST_URL}{self.user_id}"
         
-        try:
-            async with self._session.get(url, timeout=30) as response:
-                response.raise_for_status()
-                data = await response.json()
-                return data if isinstance(data, list) else []
-        except aiohttp.ClientError as err:
-            _LOGGER.error("Error fetching user devices: %s", err)
-            return []
+        # Errors propagate: an empty list would look like every device was removed
+        data = await self.hub.async_get_json(url, transport=self.transport)
+        return data if isinstance(data, list) else []
 
     async def _fetch_device_detail(self, device_id: str) -> List[Dict[str, Any]] | None:
         """Fetch detailed data for a specific device."""
         url = f"{DEVICE_DETAIL_URL}{device_id}"
         
+        # Ramp in device entries that start together instead of fetching at once
+        if self.device_id and self.data is None and not self.hub.async_is_cached(url):
+            await asyncio.sleep(self.hub.async_startup_delay())
+        
         try:
-            async with self._session.get(url, timeout=30) as response:
-                response.raise_for_status()
-                data = await response.json()
-                return data if isinstance(data, list) else []
+            data = await self.hub.async_get_json(url, transport=self.transport)
+            return data if isinstance(data, list) else []
         except aiohttp.ClientError as err:
             _LOGGER.error("Error fetching device %s detail: %s", device_id, err)
             return None
 
     async def async_start_discovery(self) -> None:
         """Start the device discovery process."""
-        await self._async_discover_devices()
+        self._async_discover_devices()
+
+    @callback
+    def _async_discover_devices(self) -> None:
+        """Diff the account's devices against the known ones.
 
-    async def _async_discover_devices(self) -> None:
-        """Discover new devices and create discovery flows."""
+        New devices raise a discovery flow, devices that disappeared from the
+        account are flagged with a repair issue. Only the changes are acted
+        upon, so this is cheap enough to run after every refresh.
+        """
         if not self.data or "user_devices" not in self.data:
             return
 
-        user_devices = self.data["user_devices"]
-        
-        for device in user_devices:
-            device_id = device.get("device_id")
-            if not device_id:
-                continue
-                
-            # Skip already discovered devices
-            if device_id in self._discovered_devices:
+        current = {
+            device["device_id"]: device
+            for device in self.data["user_devices"]
+            if device.get("device_id")
+        }
+        added = current.keys() - self._discovered_devices.keys()
+        removed = self._discovered_devices.keys() - current.keys()
+
+        for device_id in added:
+            device = current[device_id]
+            self._discovered_devices[device_id] = device.get("name") or device_id
+            
+            # A device that comes back is no longer missing
+            ir.async_delete_issue(self.hass, DOMAIN, f"device_removed_{device_id}")
+            
+            # Adopted devices are onboarded without a flow
+            if device_id in self.adopted_devices:
                 continue
-                
-            # Add to discovered devices
-            self._discovered_devices[device_id] = device
             
             # Create discovery flow
             discovery_flow.async_create_flow(
@@ -151,33 +435,364 @@ class GobzighCoordinator(DataUpdateCoordinator):
             _LOGGER.info("Discovered Gobzigh device: %s (%s)", 
                         device.get("name", "Unknown"), device_id)
 
+        for device_id in removed:
+            device_name = self._discovered_devices.pop(device_id)
+            ir.async_create_issue(
+                self.hass,
+                DOMAIN,
+                f"device_removed_{device_id}",
+                is_fixable=False,
+                severity=ir.IssueSeverity.WARNING,
+                translation_key="device_removed",
+                translation_placeholders={
+                    "device_name": device_name,
+                    "device_id": device_id,
+                },
+            )
+            _LOGGER.warning("Gobzigh device removed from account: %s (%s)",
+                          device_name, device_id)
+
+    @callback
+    def _async_forget_device(self, device_id: str) -> None:
+        """Drop the per-device state of a device that is no longer monitored."""
+        self._level_gates.pop(device_id, None)
+        self._trends.pop(device_id, None)
+        self._metrics.pop(device_id, None)
+        self._tanks.pop(device_id, None)
+        self._write_configs.pop(device_id, None)
+        self._history.async_forget_device(device_id)
+        self._attributes.pop(device_id, None)
+        self._device_info.pop(device_id, None)
+
     async def async_add_device(self, device_id: str) -> None:
         """Add a device to be monitored."""
         self._added_devices.add(device_id)
-        await self.async_request_refresh()
+        if device_id not in (self.data or {}).get("device_data", {}):
+            await self.async_request_refresh()
 
     async def async_remove_device(self, device_id: str) -> None:
         """Remove a device from monitoring."""
         self._added_devices.discard(device_id)
 
+    @callback
+    def async_update_listeners(self) -> None:
+        """Process fresh data once, then notify the entities."""
+        if not self.last_update_success:
+            # Make sure recovered entities write their state right away
+            for gate in self._level_gates.values():
+                gate.force_next()
+        elif self.data is not self._processed_data or self._reprocess:
+            # Changed options re-derive the held data without adding a reading
+            new_reading = self.data is not self._processed_data
+            self._processed_data = self.data
+            self._reprocess = False
+            device_data = self.data.get("device_data", {})
+            precomputed, self._precomputed = self._precomputed, {}
+            started = time.perf_counter()
+            self._async_process_devices(device_data, precomputed, new_reading)
+            if len(device_data) > FLEET_EXECUTOR_THRESHOLD:
+                self.timings.update(
+                    devices=len(device_data),
+                    process_loop_ms=round((time.perf_counter() - started) * 1000, 1),
+                )
+                _LOGGER.debug(
+                    "Processed %d devices in %.1f ms on the event loop, "
+                    "metrics derived in %.1f ms in the executor",
+                    len(device_data),
+                    self.timings["process_loop_ms"],
+                    self.timings.get("metrics_executor_ms", 0.0),
+                )
+            # Per-device state only lives as long as the device is in the data
+            for device_id in self._metrics.keys() - device_data.keys():
+                self._async_forget_device(device_id)
+            if self.user_id:
+                self._async_discover_devices()
+        super().async_update_listeners()
+
+    def _device_options(self, device_id: str) -> Mapping[str, Any]:
+        """Return the tank and state write settings of a device.
+
+        A device entry keeps these in its own options. An account entry keeps
+        them per device, and devices without settings are rectangular with
+        every reading written.
+        """
+        if self.device_id:
+            return self.entry.options
+        return self.entry.options.get(CONF_DEVICE_SETTINGS, {}).get(device_id, {})
+
+    def _device_tank(self, device_id: str) -> CompiledTank:
+        """Return a device's tank, whose volume table is compiled once."""
+        if (tank := self._tanks.get(device_id)) is None:
+            tank = self._tanks[device_id] = CompiledTank(
+                TankShapeConfig.from_options(self._device_options(device_id))
+            )
+        return tank
+
+    def _device_write_config(self, device_id: str) -> LevelWriteConfig:
+        """Return a device's state write settings."""
+        if (config := self._write_configs.get(device_id)) is None:
+            config = self._write_configs[device_id] = LevelWriteConfig.from_options(
+                self._device_options(device_id)
+            )
+        return config
+
+    @callback
+    def _async_process_devices(
+        self,
+        device_ids: Any,
+        precomputed: Dict[str, GobzighDeviceMetrics] | None = None,
+        new_reading: bool = True,
+    ) -> None:
+        """Run the per-device bookkeeping for devices with new data.
+
+        Metrics already derived in the executor for this data are used as is.
+        Without a ``new_reading`` the trend and history are left alone and only
+        the metrics and write gates are re-derived.
+        """
+        device_data = self.data.get("device_data", {}) if self.data else {}
+        now = time.monotonic()
+        timestamp = time.time()
+
+        for device_id in device_ids:
+            record = device_data.get(device_id)
+            if record is None:
+                continue
+            metrics = precomputed.get(device_id) if precomputed else None
+            if metrics is None:
+                metrics = _device_metrics(record, self._device_tank(device_id))
+
+            gate = self._level_gates.get(device_id)
+            if gate is None:
+                gate = self._level_gates[device_id] = LevelWriteGate()
+            tank_height_cm = metrics.tank_height * 100 if metrics.tank_height is not None else None
+            config = self._device_write_config(device_id)
+            gate.evaluate(metrics.level, tank_height_cm, config, now)
+
+            if metrics.water_height is not None:
+                trend = self._trends.get(device_id)
+                if trend is None:
+                    trend = self._trends[device_id] = LevelTrend()
+                if new_reading:
+                    trend.add(timestamp, metrics.water_height)
+                metrics.apply_trend(trend)
+            self._metrics[device_id] = metrics
+            if new_reading:
+                self._history.async_add(device_id, timestamp, metrics)
+
+            self._async_track_device_info(device_id, record)
+
+            # Built once per data change and shared by every state write
+            self._attributes[device_id] = {
+                ATTR_RELAY_STATE: record.get(ATTR_RELAY_STATE),
+                ATTR_CONNECTION_STATUS: record.get(ATTR_CONNECTION_STATUS),
+                ATTR_FIRMWARE_VERSION: record.get(ATTR_FIRMWARE_VERSION),
+                ATTR_MODEL_NAME: record.get(ATTR_MODEL_NAME),
+                ATTR_ROOM_NAME: record.get(ATTR_ROOM_NAME),
+                ATTR_SETTINGS: record.get(ATTR_SETTINGS),
+                ATTR_CONSUMPTION: record.get(ATTR_CONSUMPTION),
+                ATTR_NEXT_FIRMWARE: record.get(ATTR_NEXT_FIRMWARE),
+            }
+
+    @callback
+    def _async_track_device_info(self, device_id: str, record: Dict[str, Any]) -> None:
+        """Rebuild a device's info and sync the registry when name or firmware change."""
+        name = record.get("name")
+        firmware_version = record.get(ATTR_FIRMWARE_VERSION) or "Unknown"
+        info = self._device_info.get(device_id)
+        if (
+            info is not None
+            and info.get("name") == name
+            and info.get("sw_version") == firmware_version
+        ):
+            return
+
+        self._device_info[device_id] = DeviceInfo(
+            identifiers={(DOMAIN, device_id)},
+            connections={("mac", device_id)},
+            name=name,
+            manufacturer="Gobzigh",
+            model=record.get(ATTR_MODEL_NAME, "Unknown"),
+            sw_version=firmware_version,
+        )
+        # The first sighting is registered by the entities themselves
+        if info is not None:
+            self._device_manager.async_update_device(device_id, record)
+
+    def get_device_info(self, device_id: str, device_name: str) -> DeviceInfo:
+        """Return the device info shared by all entities of a device."""
+        if (info := self._device_info.get(device_id)) is not None and info.get("name"):
+            return info
+        return DeviceInfo(
+            identifiers={(DOMAIN, device_id)},
+            connections={("mac", device_id)},
+            name=device_name,
+            manufacturer="Gobzigh",
+            model=info.get("model", "Unknown") if info else "Unknown",
+            sw_version=info.get("sw_version", "Unknown") if info else "Unknown",
+        )
+
+    def is_level_write_suppressed(self, device_id: str) -> bool:
+        """Return True if the latest level reading of a device is within its deadband."""
+        gate = self._level_gates.get(device_id)
+        return gate is not None and gate.suppressed
+
+    def get_device_attributes(self, device_id: str) -> Dict[str, Any] | None:
+        """Return the shared state attributes of a device."""
+        return self._attributes.get(device_id)
+
+    def get_metrics(self, device_id: str) -> GobzighDeviceMetrics | None:
+        """Return the precomputed sensor values of a device."""
+        return self._metrics.get(device_id)
+
+    @callback
+    def async_add_device_listener(
+        self, device_id: str, update_callback: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for updates that only concern a single device."""
+        listeners = self._device_listeners.setdefault(device_id, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the device listener."""
+            listeners.remove(update_callback)
+            if not listeners:
+                self._device_listeners.pop(device_id, None)
+
+        return remove_listener
+
+    async def async_apply_device_updates(
+        self, records: List[Dict[str, Any]]
+    ) -> int:
+        """Merge pushed device records into the current data.
+
+        Only the entities of the devices present in ``records`` are notified,
+        so a batch touching a handful of tanks does not rewrite the state of
+        every entity on the account.
+        """
+        if not self.data:
+            return 0
+
+        device_data: Dict[str, Dict[str, Any]] = self.data.setdefault("device_data", {})
+        # The account list is our own filtered copy, never the hub's cached response
+        user_devices: List[Dict[str, Any]] | None = self.data.get("user_devices")
+        positions: Dict[str, int] = {}
+        if user_devices is not None:
+            positions = self._device_positions(user_devices)
+
+        changed: list[str] = []
+        for count, record in enumerate(records, 1):
+            device_id = record.get("device_id")
+            if not device_id or (self.device_id and device_id != self.device_id):
+                continue
+
+            # Records may be partial, so merge over what we already know
+            known = device_data.get(device_id)
+            merged = None
+            if known is not None:
+                merged = device_data[device_id] = {**known, **record}
+                changed.append(device_id)
+
+            if user_devices is not None:
+                if device_id in positions:
+                    position = positions[device_id]
+                    listed = user_devices[position]
+                    # Keep sharing one record between the list and device_data
+                    user_devices[position] = (
+                        merged if listed is known and merged is not None else {**listed, **record}
+                    )
+                else:
+                    positions[device_id] = len(user_devices)
+                    user_devices.append(record)
+
+            # Give the event loop a chance to breathe on very large batches
+            if count % WEBHOOK_MERGE_CHUNK == 0:
+                await asyncio.sleep(0)
+
+        # Cached responses predate the push and must not bring the old records back
+        self.hub.async_invalidate_device_records(
+            [record["device_id"] for record in records if record.get("device_id")],
+            self.user_id,
+        )
+
+        self._async_process_devices(changed)
+        for device_id in changed:
+            for update_callback in list(self._device_listeners.get(device_id, ())):
+                update_callback()
+
+        _LOGGER.debug(
+            "Applied %d pushed records, %d monitored devices changed",
+            len(records),
+            len(changed),
+        )
+        return len(changed)
+
+    def _device_positions(self, user_devices: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Return each device's index in the account list.
+
+        Built once per polled list and kept up to date by pushes, so merging
+        a push costs the size of the push rather than of the fleet.
+        """
+        if self._indexed_devices is not user_devices:
+            self._indexed_devices = user_devices
+            self._positions = {
+                device.get("device_id"): index for index, device in enumerate(user_devices)
+            }
+        return self._positions
+
+    def has_device(self, device_id: str) -> bool:
+        """Return True if this coordinator tracks or lists a device."""
+        if self.data and device_id in self.data.get("device_data", {}):
+            return True
+        return device_id in self._discovered_devices
+
     def reset_device_discovery(self, device_id: str) -> None:
         """Reset device discovery status to allow rediscovery."""
         self._discovered_devices.pop(device_id, None)
         _LOGGER.debug("Reset discovery for device: %s", device_id)
 
-    def get_device_type_info(self, model_name: str) -> Dict[str, Any] | None:
-        """Get device type information from model name."""
-        for device_type in DEVICE_TYPES:
-            if device_type["device_type_code"] == model_name:
-                return device_type
-        return None
+    @callback
+    def async_start_polling(self) -> None:
+        """Join the hub's interleaved schedule, or start a device's staggered timer."""
+        if self.user_id:
+            self.hub.async_register_account(self)
+        elif self.device_id:
+            self._async_schedule_device_poll()
+
+    def _poll_offset(self) -> float:
+        """Return the device's stable position within the scan interval, in seconds.
 
-    def get_discovered_device(self, device_id: str) -> Dict[str, Any] | None:
-        """Get discovered device data."""
-        return self._discovered_devices.get(device_id)
+        Derived from a hash of the device ID, so device entries are spread
+        evenly over the interval and keep their slot across restarts.
+        """
+        return zlib.crc32(self.device_id.encode()) / 2**32 * self.scan_interval
+
+    @callback
+    def _async_schedule_device_poll(self) -> None:
+        """Schedule the next poll of a device entry at its offset in the interval."""
+        if self._unsub_poll:
+            self._unsub_poll()
+        interval = self.scan_interval
+        delay = (self._poll_offset() - time.time()) % interval
+        if delay < 1:
+            # Just polled; a timer that fired early must not poll twice
+            delay += interval
+        self._unsub_poll = async_call_later(self.hass, delay, self._async_device_poll)
+
+    @callback
+    def _async_device_poll(self, _now: Any) -> None:
+        """Poll a device entry and schedule its next slot."""
+        self._async_schedule_device_poll()
+        self.hass.async_create_background_task(
+            self.async_refresh(), f"{DOMAIN} poll {self.device_id}"
+        )
 
     async def async_shutdown(self) -> None:
         """Shutdown coordinator and cleanup resources."""
-        if self._session:
-            await self._session.close()
-            self._session = None
+        if self._unsub_poll:
+            self._unsub_poll()
+            self._unsub_poll = None
+        self.async_cancel_refresh()
+        self.hub.async_unregister_account(self)
+        await self.transport.async_close()
+        await super().async_shutdown()
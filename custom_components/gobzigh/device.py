@@ -4,7 +4,7 @@ from __future__ import annotations
 import logging
 from typing import Any, Dict
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
 
 from .const import DOMAIN
@@ -54,7 +54,8 @@ class GobzighDeviceManager:
         
         return device
 
-    async def async_update_device(
+    @callback
+    def async_update_device(
         self,
         device_id: str,
         device_data: Dict[str, Any]
@@ -0,0 +1,30 @@
+"""Diagnostics support for the Gobzigh integration."""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_USER_ID, CONF_WEBHOOK_ID, CONF_WEBHOOK_SECRET, DOMAIN
+from .hub import async_get_hub
+
+TO_REDACT = {CONF_USER_ID, CONF_WEBHOOK_ID, CONF_WEBHOOK_SECRET, "user_id", "loc_id"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return diagnostics for a config entry, including the shared request limiter."""
+    coordinator = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    device_data = (coordinator.data or {}).get("device_data", {}) if coordinator else {}
+    return {
+        "entry": async_redact_data(
+            {"data": dict(entry.data), "options": dict(entry.options)}, TO_REDACT
+        ),
+        "devices": len(device_data),
+        "last_update_success": coordinator.last_update_success if coordinator else None,
+        "timings": coordinator.timings if coordinator else {},
+        "hub": async_get_hub(hass).async_stats(),
+    }
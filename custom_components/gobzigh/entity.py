@@ -0,0 +1,44 @@
+"""Base entity for the Gobzigh integration."""
+from __future__ import annotations
+
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import GobzighCoordinator
+
+
+class GobzighEntity(CoordinatorEntity[GobzighCoordinator]):
+    """Common behaviour of the entities of one Gobzigh device."""
+
+    def __init__(
+        self,
+        coordinator: GobzighCoordinator,
+        device_id: str,
+        device_name: str,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self._device_id = device_id
+        self._device_name = device_name
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to pushed updates for this device."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_device_listener(
+                self._device_id, self._handle_coordinator_update
+            )
+        )
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device information shared by all entities of the device."""
+        return self.coordinator.get_device_info(self._device_id, self._device_name)
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return (
+            self.coordinator.last_update_success
+            and self._device_id in self.coordinator.data.get("device_data", {})
+        )
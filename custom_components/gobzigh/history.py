@@ -0,0 +1,347 @@
+"""Local level history with precomputed rollups for Gobzigh devices."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import time
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Tuple
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    HISTORY_BATCH_SIZE,
+    HISTORY_FILE,
+    HISTORY_FLUSH_INTERVAL,
+    HISTORY_MAX_POINTS,
+    HISTORY_METRICS,
+    HISTORY_MIN_SPACING,
+    HISTORY_RESOLUTION_DAY,
+    HISTORY_RESOLUTIONS,
+    HISTORY_RETENTION,
+)
+from .metrics import GobzighDeviceMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_HISTORY = f"{DOMAIN}_history"
+
+# Seconds between retention sweeps
+_PRUNE_INTERVAL = 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollups (
+    resolution INTEGER NOT NULL,
+    device_id TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    total REAL NOT NULL,
+    minimum REAL NOT NULL,
+    maximum REAL NOT NULL,
+    PRIMARY KEY (resolution, device_id, metric, bucket)
+) WITHOUT ROWID
+"""
+
+_UPSERT = """
+INSERT INTO rollups (resolution, device_id, metric, bucket, count, total, minimum, maximum)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (resolution, device_id, metric, bucket) DO UPDATE SET
+    count = count + excluded.count,
+    total = total + excluded.total,
+    minimum = min(minimum, excluded.minimum),
+    maximum = max(maximum, excluded.maximum)
+"""
+
+# (resolution, device_id, metric, bucket) -> [count, total, minimum, maximum]
+_Rollups = Dict[Tuple[int, str, str, int], List[float]]
+
+
+@callback
+def async_get_history(hass: HomeAssistant) -> GobzighHistoryStore:
+    """Return the process-wide history store, creating it on first use."""
+    if (store := hass.data.get(DATA_HISTORY)) is None:
+        store = hass.data[DATA_HISTORY] = GobzighHistoryStore(
+            hass, hass.config.path(HISTORY_FILE)
+        )
+        store.async_start()
+    return store
+
+
+async def async_unload_history(hass: HomeAssistant) -> None:
+    """Write what is left and close the store once no entry uses it."""
+    if (store := hass.data.pop(DATA_HISTORY, None)) is not None:
+        await store.async_stop()
+
+
+def pick_resolution(start: float, end: float, max_points: int = HISTORY_MAX_POINTS) -> int:
+    """Return the finest rollup that covers a range in at most ``max_points``."""
+    span = max(end - start, 0)
+    for resolution in HISTORY_RESOLUTIONS:
+        if span / resolution <= max_points:
+            return resolution
+    return HISTORY_RESOLUTIONS[-1]
+
+
+class GobzighHistoryStore:
+    """Keep downsampled level history of every device in a local SQLite file.
+
+    Each processed poll adds one sample per device to an in-memory buffer.
+    The buffer is folded into minute, hour and day rollups (count, sum, min
+    and max per bucket) and written in one executor job per flush, so the
+    database sees a single transaction however large the fleet is. Charts
+    read the rollups instead of scanning recorder state rows.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self._path = path
+        self._connection: sqlite3.Connection | None = None
+        # Every database job runs one at a time on the executor
+        self._lock = asyncio.Lock()
+        self._pending: List[Tuple[str, float, GobzighDeviceMetrics]] = []
+        self._last_sample: Dict[str, float] = {}
+        self._last_prune = 0.0
+        self._flushing: asyncio.Task[None] | None = None
+        self._unsub_timer: Any = None
+        self._unsub_stop: Any = None
+
+    @callback
+    def async_start(self) -> None:
+        """Flush on a timer and once more when Home Assistant stops."""
+        self._unsub_timer = async_track_time_interval(
+            self.hass, self._async_scheduled_flush, timedelta(seconds=HISTORY_FLUSH_INTERVAL)
+        )
+        self._unsub_stop = self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._async_stop
+        )
+
+    @callback
+    def async_add(self, device_id: str, timestamp: float, metrics: GobzighDeviceMetrics) -> None:
+        """Buffer one sample of a device's level metrics.
+
+        Samples closer together than ``HISTORY_MIN_SPACING`` are dropped, so a
+        device reported by both an account and its own entry counts once.
+        """
+        if metrics.water_height is None:
+            return
+        last = self._last_sample.get(device_id)
+        if last is not None and timestamp - last < HISTORY_MIN_SPACING:
+            return
+        self._last_sample[device_id] = timestamp
+        self._pending.append((device_id, timestamp, metrics))
+
+        if len(self._pending) >= HISTORY_BATCH_SIZE and self._flushing is None:
+            self._flushing = self.hass.async_create_background_task(
+                self._async_flush_batch(), f"{DOMAIN} history flush"
+            )
+
+    @callback
+    def async_forget_device(self, device_id: str) -> None:
+        """Drop the in-memory state of a device that is no longer monitored."""
+        self._last_sample.pop(device_id, None)
+
+    async def async_flush(self) -> None:
+        """Write all buffered samples."""
+        if not self._pending:
+            return
+        samples, self._pending = self._pending, []
+        rollups = _fold(samples)
+        now = time.time()
+        prune = now - self._last_prune >= _PRUNE_INTERVAL
+        if prune:
+            self._last_prune = now
+        async with self._lock:
+            try:
+                await self.hass.async_add_executor_job(self._write, rollups, now if prune else None)
+            except sqlite3.Error as err:
+                _LOGGER.warning("Failed to write Gobzigh history: %s", err)
+                return
+        _LOGGER.debug(
+            "Wrote %d history samples as %d rollup rows", len(samples), len(rollups)
+        )
+
+    async def async_query(
+        self,
+        device_ids: Iterable[str],
+        start: float,
+        end: float,
+        metrics: Iterable[str] = HISTORY_METRICS,
+        resolution: int | None = None,
+    ) -> Dict[str, Any]:
+        """Return the downsampled series of several devices in one call.
+
+        Without a ``resolution`` the finest rollup that keeps each series
+        under ``HISTORY_MAX_POINTS`` is used.
+        """
+        if resolution is None:
+            resolution = pick_resolution(start, end)
+        await self.async_flush()
+        async with self._lock:
+            series = await self.hass.async_add_executor_job(
+                self._read, list(device_ids), list(metrics), resolution, start, end
+            )
+        return {"resolution": resolution, "series": series}
+
+    @callback
+    def _async_scheduled_flush(self, _now: Any) -> None:
+        """Flush the buffer on the timer."""
+        if self._pending and self._flushing is None:
+            self._flushing = self.hass.async_create_background_task(
+                self._async_flush_batch(), f"{DOMAIN} history flush"
+            )
+
+    async def _async_flush_batch(self) -> None:
+        """Flush from a background task."""
+        try:
+            await self.async_flush()
+        finally:
+            self._flushing = None
+
+    async def async_stop(self) -> None:
+        """Stop the timers, write what is left and close the database."""
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if self._unsub_stop:
+            self._unsub_stop()
+            self._unsub_stop = None
+        if self._flushing:
+            await self._flushing
+        await self.async_flush()
+        async with self._lock:
+            await self.hass.async_add_executor_job(self._close)
+
+    async def _async_stop(self, _event: Event) -> None:
+        """Close the store when Home Assistant stops."""
+        # The listener has fired and must not be removed again
+        self._unsub_stop = None
+        await self.async_stop()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use (runs in the executor)."""
+        if self._connection is None:
+            connection = sqlite3.connect(self._path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def _write(self, rollups: _Rollups, prune_before: float | None) -> None:
+        """Merge rollups into the database in one transaction (runs in the executor)."""
+        connection = self._connect()
+        with connection:
+            connection.executemany(
+                _UPSERT, [(*key, *values) for key, values in rollups.items()]
+            )
+            if prune_before is not None:
+                connection.executemany(
+                    "DELETE FROM rollups WHERE resolution = ? AND bucket < ?",
+                    [
+                        (resolution, int(prune_before - retention))
+                        for resolution, retention in HISTORY_RETENTION.items()
+                    ],
+                )
+
+    def _read(
+        self,
+        device_ids: List[str],
+        metrics: List[str],
+        resolution: int,
+        start: float,
+        end: float,
+    ) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """Read rollups of one resolution for a range (runs in the executor)."""
+        series: Dict[str, Dict[str, List[Dict[str, Any]]]] = {
+            device_id: {metric: [] for metric in metrics} for device_id in device_ids
+        }
+        if not device_ids or not metrics:
+            return series
+        rows = self._connect().execute(
+            "SELECT device_id, metric, bucket, count, total, minimum, maximum"
+            " FROM rollups WHERE resolution = ?"
+            f" AND device_id IN ({','.join('?' * len(device_ids))})"
+            f" AND metric IN ({','.join('?' * len(metrics))})"
+            " AND bucket >= ? AND bucket <= ?"
+            " ORDER BY device_id, metric, bucket",
+            (
+                resolution,
+                *device_ids,
+                *metrics,
+                bucket_start(start, resolution),
+                int(end),
+            ),
+        )
+        for device_id, metric, bucket, count, total, minimum, maximum in rows:
+            series[device_id][metric].append(
+                {
+                    "start": dt_util.utc_from_timestamp(bucket).isoformat(),
+                    "mean": round(total / count, 4),
+                    "min": minimum,
+                    "max": maximum,
+                }
+            )
+        return series
+
+    def _close(self) -> None:
+        """Close the database (runs in the executor)."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def _local_day(timestamp: float) -> Tuple[int, int]:
+    """Return the start and end of the local day holding a timestamp."""
+    start = dt_util.start_of_local_day(
+        dt_util.as_local(dt_util.utc_from_timestamp(timestamp))
+    )
+    # Days around a DST change are 23 or 25 hours long
+    end = dt_util.start_of_local_day(start + timedelta(days=1, hours=1))
+    return int(start.timestamp()), int(end.timestamp())
+
+
+def bucket_start(timestamp: float, resolution: int) -> int:
+    """Return the start of the rollup bucket holding a timestamp.
+
+    Day buckets start at local midnight; finer ones on multiples of their
+    length.
+    """
+    if resolution == HISTORY_RESOLUTION_DAY:
+        return _local_day(timestamp)[0]
+    return int(timestamp // resolution * resolution)
+
+
+def _fold(samples: List[Tuple[str, float, GobzighDeviceMetrics]]) -> _Rollups:
+    """Fold samples into rollup rows for every resolution."""
+    rollups: _Rollups = {}
+    day_start = day_end = 0
+    for device_id, timestamp, metrics in samples:
+        # Samples of one flush nearly always share their local day
+        if not day_start <= timestamp < day_end:
+            day_start, day_end = _local_day(timestamp)
+        buckets = {
+            resolution: day_start
+            if resolution == HISTORY_RESOLUTION_DAY
+            else int(timestamp // resolution * resolution)
+            for resolution in HISTORY_RESOLUTIONS
+        }
+        for metric in HISTORY_METRICS:
+            if (value := getattr(metrics, metric)) is None:
+                continue
+            for resolution in HISTORY_RESOLUTIONS:
+                key = (resolution, device_id, metric, buckets[resolution])
+                if (row := rollups.get(key)) is None:
+                    rollups[key] = [1, value, value, value]
+                else:
+                    row[0] += 1
+                    row[1] += value
+                    row[2] = min(row[2], value)
+                    row[3] = max(row[3], value)
+    return rollups
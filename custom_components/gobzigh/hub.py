@@ -0,0 +1,465 @@
+"""Shared connection pool and poll scheduler for Gobzigh accounts."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Tuple
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    CACHE_SWEEP_INTERVAL,
+    DEVICE_DETAIL_URL,
+    DOMAIN,
+    MAX_CONCURRENT_REQUESTS,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    PRIORITY_BACKGROUND,
+    PRIORITY_COMMAND,
+    PRIORITY_INTERACTIVE,
+    RESPONSE_CACHE_TTL,
+    SEED_CACHE_TTL,
+    STARTUP_RAMP_WINDOW,
+    USER_DEVICE_LIST_URL,
+)
+from .transport import GobzighTransport, HttpTransport
+
+if TYPE_CHECKING:
+    from .coordinator import GobzighCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_HUB = f"{DOMAIN}_hub"
+
+_PRIORITY_NAMES = {
+    PRIORITY_COMMAND: "command",
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_BACKGROUND: "background",
+}
+
+
+@callback
+def async_get_hub(hass: HomeAssistant) -> GobzighHub:
+    """Return the process-wide Gobzigh hub, creating it on first use."""
+    if (hub := hass.data.get(DATA_HUB)) is None:
+        hub = hass.data[DATA_HUB] = GobzighHub(hass)
+    return hub
+
+
+class _PriorityLimiter:
+    """Cap concurrent requests and their rate, serving the most urgent waiter first.
+
+    A request needs a free slot and a token from a bucket that refills at
+    ``rate`` tokens per second up to ``burst``. Lower priority values go
+    first; waiters of equal priority are served in arrival order. While the
+    bucket is empty the head of the queue waits for the next token, so a
+    burst of polls cannot starve a relay command queued behind it.
+    """
+
+    def __init__(self, limit: int, rate: float, burst: int) -> None:
+        """Initialize the limiter."""
+        self._limit = limit
+        self._free = limit
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+        # priority -> [requests, delayed requests, total wait, longest wait]
+        self._stats: Dict[int, List[float]] = {}
+        self._max_queued = 0
+
+    @property
+    def rate(self) -> float:
+        """Return the tokens added per second."""
+        return self._rate
+
+    @property
+    def burst(self) -> int:
+        """Return the bucket size."""
+        return self._burst
+
+    def configure(self, rate: float, burst: int) -> None:
+        """Change the refill rate and bucket size."""
+        self._refill()
+        self._rate = rate
+        self._burst = burst
+        self._tokens = min(self._tokens, float(burst))
+        if self._wakeup:
+            self._wakeup.cancel()
+            self._wakeup = None
+        self._dispatch()
+
+    @asynccontextmanager
+    async def acquire(self, priority: int) -> AsyncIterator[None]:
+        """Hold one request slot for the duration of the block."""
+        if self._free and not self._waiters and self._take_token():
+            self._free -= 1
+            self._record(priority, 0.0)
+        else:
+            started = time.monotonic()
+            future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+            self._max_queued = max(self._max_queued, len(self._waiters))
+            self._dispatch()
+            try:
+                await future
+            except asyncio.CancelledError:
+                # Pass on a slot that was handed over just as we were cancelled
+                if future.done() and not future.cancelled():
+                    self._release()
+                raise
+            self._record(priority, time.monotonic() - started)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def stats(self, names: Dict[int, str]) -> Dict[str, Any]:
+        """Return the bucket state and per-priority queueing figures."""
+        self._refill()
+        return {
+            "rate": self._rate,
+            "burst": self._burst,
+            "tokens": round(self._tokens, 2),
+            "in_flight": self._limit - self._free,
+            "queued": sum(not future.done() for _, _, future in self._waiters),
+            "max_queued": self._max_queued,
+            "priorities": {
+                names.get(priority, str(priority)): {
+                    "requests": int(requests),
+                    "delayed": int(delayed),
+                    "average_wait": round(waited / requests, 3),
+                    "longest_wait": round(longest, 3),
+                }
+                for priority, (requests, delayed, waited, longest) in sorted(
+                    self._stats.items()
+                )
+            },
+        }
+
+    def _record(self, priority: int, waited: float) -> None:
+        """Count one granted request."""
+        if (stats := self._stats.get(priority)) is None:
+            stats = self._stats[priority] = [0, 0, 0.0, 0.0]
+        stats[0] += 1
+        if waited > 0:
+            stats[1] += 1
+            stats[2] += waited
+            stats[3] = max(stats[3], waited)
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(float(self._burst), self._tokens + (now - self._refilled) * self._rate)
+        self._refilled = now
+
+    def _take_token(self) -> bool:
+        """Spend a token if one is available."""
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _release(self) -> None:
+        """Return a slot and hand it on."""
+        self._free += 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant slots and tokens to waiters in priority order."""
+        while self._waiters and self._free:
+            future = self._waiters[0][2]
+            if future.done():
+                # Cancelled while queued
+                heapq.heappop(self._waiters)
+                continue
+            if not self._take_token():
+                if self._wakeup is None:
+                    delay = (1 - self._tokens) / self._rate
+                    self._wakeup = asyncio.get_running_loop().call_later(delay, self._async_wakeup)
+                return
+            heapq.heappop(self._waiters)
+            self._free -= 1
+            future.set_result(None)
+
+    def _async_wakeup(self) -> None:
+        """Serve the queue once the next token is due."""
+        self._wakeup = None
+        self._dispatch()
+
+
+class GobzighHub:
+    """Share one connection pool, request limiter and response cache.
+
+    Every account (main config entry) registers its coordinator here instead
+    of running its own timer. Each account is polled at its own scan
+    interval, with phases spread evenly over one shared timer, so polls are
+    interleaved rather than bunched together. Each refresh runs as its own task: a slow or
+    failing account only delays itself.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self.hass = hass
+        self.session = async_get_clientsession(hass)
+        self.transport: GobzighTransport = HttpTransport(hass, self.session)
+        self._limiter = _PriorityLimiter(
+            MAX_CONCURRENT_REQUESTS, DEFAULT_RATE_LIMIT, DEFAULT_RATE_BURST
+        )
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._next_sweep = 0.0
+        self._accounts: List[GobzighCoordinator] = []
+        self._refreshing: Dict[str, asyncio.Task[None]] = {}
+        # entry_id -> (monotonic time of the next poll, the account's own interval)
+        self._schedule: Dict[str, Tuple[float, float]] = {}
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._started = time.monotonic()
+        self._ramp_slots = itertools.count()
+
+    async def async_get_json(
+        self,
+        url: str,
+        cache_ttl: float = RESPONSE_CACHE_TTL,
+        priority: int = PRIORITY_BACKGROUND,
+        fresh: bool = False,
+        transport: GobzighTransport | None = None,
+    ) -> Any:
+        """Fetch a JSON document, reusing a recent response for the same URL.
+
+        ``fresh`` skips the cached response, and a lower ``priority`` value
+        jumps ahead of requests already waiting for a slot. Accounts that
+        capture or replay traffic pass their own ``transport``.
+        """
+        now = time.monotonic()
+        cached = self._cache.get(url)
+        if cached and cached[0] > now and not fresh:
+            return cached[1]
+
+        async with self._limiter.acquire(priority):
+            data = await (transport or self.transport).async_request("GET", url)
+
+        if cache_ttl > 0:
+            self._expire_cache(now)
+            self._cache[url] = (now + cache_ttl, data)
+        return data
+
+    async def async_post_json(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        transport: GobzighTransport | None = None,
+    ) -> None:
+        """Send a JSON command through the shared pool, ahead of any query."""
+        async with self._limiter.acquire(PRIORITY_COMMAND):
+            await (transport or self.transport).async_request("POST", url, payload)
+        # The command changed device state, cached responses are now stale
+        self.async_clear_cache()
+
+    @callback
+    def async_clear_cache(self) -> None:
+        """Drop every cached response."""
+        self._cache.clear()
+
+    @callback
+    def async_set_rate_limit(self, rate: float, burst: int) -> None:
+        """Apply a rate limit until an account is added, removed or changed.
+
+        Accounts normally set the limit; the benchmarks use this to measure
+        the coordinator rather than the limiter's waits.
+        """
+        self._limiter.configure(rate, burst)
+
+    @callback
+    def async_seed_user_devices(
+        self,
+        user_id: str,
+        devices: List[Dict[str, Any]],
+        ttl: float = SEED_CACHE_TTL,
+    ) -> None:
+        """Seed the cache with an account's device list.
+
+        The config flow's validation response becomes the first refresh of
+        the new entry, and each listed record answers the detail request of
+        a device entry set up shortly after, so onboarding costs one call.
+        """
+        expires = time.monotonic() + ttl
+        self._cache[f"{USER_DEVICE_LIST_URL}{user_id}"] = (expires, devices)
+        self.async_seed_device_records(devices, ttl)
+
+    @callback
+    def async_seed_device_records(
+        self, devices: List[Dict[str, Any]], ttl: float = SEED_CACHE_TTL
+    ) -> None:
+        """Seed the cache with device detail responses taken from a device list."""
+        now = time.monotonic()
+        self._expire_cache(now)
+        expires = now + ttl
+        for device in devices:
+            if device_id := device.get("device_id"):
+                self._cache[f"{DEVICE_DETAIL_URL}{device_id}"] = (expires, [device])
+
+    @callback
+    def async_invalidate_device_records(
+        self, device_ids: List[str], user_id: str | None = None
+    ) -> None:
+        """Drop cached responses that hold outdated records of these devices."""
+        for device_id in device_ids:
+            self._cache.pop(f"{DEVICE_DETAIL_URL}{device_id}", None)
+        if user_id:
+            self._cache.pop(f"{USER_DEVICE_LIST_URL}{user_id}", None)
+
+    @callback
+    def async_is_cached(self, url: str) -> bool:
+        """Return True if a request would be answered from the cache."""
+        cached = self._cache.get(url)
+        return cached is not None and cached[0] > time.monotonic()
+
+    @callback
+    def async_startup_delay(self) -> float:
+        """Return how long a first fetch should wait to spread startup load.
+
+        Fetches made within ``STARTUP_RAMP_WINDOW`` of the hub starting are
+        handed evenly spaced slots across the window, one per config entry.
+        """
+        if time.monotonic() - self._started > STARTUP_RAMP_WINDOW:
+            return 0.0
+        entries = max(len(self.hass.config_entries.async_entries(DOMAIN)), 1)
+        return STARTUP_RAMP_WINDOW * (next(self._ramp_slots) % entries) / entries
+
+    def _expire_cache(self, now: float) -> None:
+        """Drop expired responses so the cache stays bounded.
+
+        Lookups already ignore expired entries, so the full sweep only runs
+        once per ``CACHE_SWEEP_INTERVAL`` however many requests miss.
+        """
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + CACHE_SWEEP_INTERVAL
+        for url in [url for url, (expires, _) in self._cache.items() if expires <= now]:
+            del self._cache[url]
+
+    @callback
+    def async_stats(self) -> Dict[str, Any]:
+        """Return the request limiter's state and queueing figures."""
+        return {
+            "accounts": len(self._accounts),
+            "cached_responses": len(self._cache),
+            "limiter": self._limiter.stats(_PRIORITY_NAMES),
+        }
+
+    @callback
+    def async_register_account(self, coordinator: GobzighCoordinator) -> None:
+        """Add an account coordinator to the shared poll schedule."""
+        if coordinator not in self._accounts:
+            self._accounts.append(coordinator)
+            self._async_reschedule()
+            self._async_update_rate()
+
+    @callback
+    def async_unregister_account(self, coordinator: GobzighCoordinator) -> None:
+        """Remove an account coordinator from the shared poll schedule."""
+        if coordinator in self._accounts:
+            self._accounts.remove(coordinator)
+            self._async_reschedule()
+            self._async_update_rate()
+
+    @callback
+    def async_update_account(self, coordinator: GobzighCoordinator) -> None:
+        """Pick up an account's changed scan interval and rate limit."""
+        if coordinator not in self._accounts:
+            return
+        if coordinator.scan_interval != self._schedule[coordinator.entry.entry_id][1]:
+            self._async_reschedule()
+        self._async_update_rate()
+
+    @callback
+    def _async_update_rate(self) -> None:
+        """Apply the strictest rate limit configured by any account."""
+        rate = min(
+            (account.rate_limit for account in self._accounts), default=DEFAULT_RATE_LIMIT
+        )
+        burst = min(
+            (account.rate_burst for account in self._accounts), default=DEFAULT_RATE_BURST
+        )
+        if (rate, burst) != (self._limiter.rate, self._limiter.burst):
+            self._limiter.configure(rate, burst)
+            _LOGGER.debug("Limiting Gobzigh API requests to %s/s, bursts of %d", rate, burst)
+
+    @callback
+    def _async_reschedule(self) -> None:
+        """Give every account its own period and spread their phases evenly.
+
+        Account ``i`` of ``n`` first polls ``(i + 1) / n`` of its own scan
+        interval from now and then once per interval, so accounts stay
+        interleaved without any of them polling more often than configured.
+        """
+        now = time.monotonic()
+        self._schedule = {}
+        for index, account in enumerate(self._accounts):
+            interval = account.scan_interval
+            self._schedule[account.entry.entry_id] = (
+                now + interval * (index + 1) / len(self._accounts),
+                interval,
+            )
+        _LOGGER.debug(
+            "Polling %d Gobzigh accounts at %s second intervals",
+            len(self._accounts),
+            sorted({interval for _, interval in self._schedule.values()}),
+        )
+        self._async_schedule_tick()
+
+    @callback
+    def _async_schedule_tick(self) -> None:
+        """Wake up for the account poll that is due first."""
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if not self._schedule:
+            return
+        due = min(deadline for deadline, _ in self._schedule.values())
+        self._unsub_timer = async_call_later(
+            self.hass, max(due - time.monotonic(), 0), self._async_tick
+        )
+
+    @callback
+    def _async_tick(self, _now: Any) -> None:
+        """Refresh the accounts that are due and move them to their next slot."""
+        self._unsub_timer = None
+        now = time.monotonic()
+        for coordinator in self._accounts:
+            entry_id = coordinator.entry.entry_id
+            deadline, interval = self._schedule[entry_id]
+            if deadline > now:
+                continue
+            # Keep the account's phase; a late tick does not make it poll twice
+            deadline += interval
+            if deadline <= now:
+                deadline = now + interval
+            self._schedule[entry_id] = (deadline, interval)
+
+            if entry_id in self._refreshing:
+                _LOGGER.debug("Previous poll of %s still running, skipping", coordinator.user_id)
+                continue
+            self._refreshing[entry_id] = self.hass.async_create_background_task(
+                self._async_refresh_account(coordinator), f"{DOMAIN} poll {entry_id}"
+            )
+        self._async_schedule_tick()
+
+    async def _async_refresh_account(self, coordinator: GobzighCoordinator) -> None:
+        """Refresh one account; failures stay within its coordinator."""
+        try:
+            await coordinator.async_refresh()
+        except asyncio.CancelledError:
+            _LOGGER.debug("Poll of %s cancelled", coordinator.user_id)
+        finally:
+            self._refreshing.pop(coordinator.entry.entry_id, None)
@@ -0,0 +1,99 @@
+"""Precomputed per-device values shared by all Gobzigh sensors."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from .const import (
+    ATTR_CONNECTION_STATUS,
+    ATTR_SETTINGS,
+    SETTINGS_HEIGHT,
+    SETTINGS_LENGTH,
+    SETTINGS_S_DIST,
+    SETTINGS_WIDTH,
+    TANK_SHAPE_RECTANGULAR,
+)
+from .tank import CompiledTank
+from .trend import LevelTrend
+
+
+def _to_meters(value: Any) -> float | None:
+    """Convert a centimeter setting to meters."""
+    return float(value) / 100 if value is not None else None
+
+
+@dataclass(slots=True)
+class GobzighDeviceMetrics:
+    """Every value a device's sensors report, computed once per data update."""
+
+    level: float | None = None  # raw sensor reading, cm
+    tank_height: float | None = None  # m
+    tank_width: float | None = None  # m
+    tank_length: float | None = None  # m
+    sensor_distance: float | None = None  # m
+    water_height: float | None = None  # m
+    current_volume: float | None = None  # m³
+    max_volume: float | None = None  # m³
+    percentage: float | None = None  # %
+    connected: bool = False
+    fill_rate: float | None = None  # m/h
+    smoothed_water_height: float | None = None  # m
+    time_to_empty: float | None = None  # h
+    time_to_full: float | None = None  # h
+
+    @classmethod
+    def from_record(
+        cls,
+        device_data: Dict[str, Any],
+        tank_geometry: bool = True,
+        tank: CompiledTank | None = None,
+    ) -> GobzighDeviceMetrics:
+        """Derive the metrics of a device record.
+
+        Models without tank geometry only get their reading and connection.
+        Non-rectangular tanks convert water height to volume through the
+        lookup table their ``tank`` keeps compiled.
+        """
+        sensor_val = device_data.get("sensor_val")
+        metrics = cls(
+            level=float(sensor_val) if sensor_val is not None else None,
+            connected=bool(device_data.get(ATTR_CONNECTION_STATUS)),
+        )
+        if not tank_geometry:
+            return metrics
+
+        settings = device_data.get(ATTR_SETTINGS) or {}
+        metrics.tank_height = _to_meters(settings.get(SETTINGS_HEIGHT))
+        metrics.tank_width = _to_meters(settings.get(SETTINGS_WIDTH))
+        metrics.tank_length = _to_meters(settings.get(SETTINGS_LENGTH))
+        metrics.sensor_distance = _to_meters(settings.get(SETTINGS_S_DIST))
+
+        height = metrics.tank_height
+        if metrics.level is not None and height is not None and metrics.sensor_distance is not None:
+            metrics.water_height = max(
+                0.0, height + metrics.sensor_distance - metrics.level / 100
+            )
+
+        if tank is not None and tank.config.shape != TANK_SHAPE_RECTANGULAR:
+            table = tank.table(height, metrics.tank_width, metrics.tank_length)
+            if table is not None:
+                metrics.max_volume = table.max_volume
+                if metrics.water_height is not None:
+                    metrics.current_volume = table.volume(metrics.water_height)
+        elif height is not None and metrics.tank_width is not None and metrics.tank_length is not None:
+            footprint = metrics.tank_width * metrics.tank_length
+            metrics.max_volume = height * footprint
+            if metrics.water_height is not None:
+                metrics.current_volume = metrics.water_height * footprint
+
+        if metrics.current_volume is not None and metrics.max_volume:
+            metrics.percentage = metrics.current_volume / metrics.max_volume * 100
+
+        return metrics
+
+    def apply_trend(self, trend: LevelTrend) -> None:
+        """Copy the rolling level statistics of the device."""
+        self.fill_rate = trend.rate
+        self.smoothed_water_height = trend.smoothed
+        self.time_to_empty = trend.time_to_empty()
+        self.time_to_full = trend.time_to_full(self.tank_height)
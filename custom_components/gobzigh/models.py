@@ -0,0 +1,86 @@
+"""Model capability registry for Gobzigh devices."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+from .const import ATTR_SETTINGS, DEVICE_TYPES, SETTINGS_HAS_RELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class GobzighModel:
+    """Capabilities of a Gobzigh device model."""
+
+    code: str
+    name: str
+    generation: str
+    docs_url: str | None
+    sensors: tuple[str, ...]
+    # Model can carry a relay; the device's has_relay setting says if it does
+    relay: bool
+    # Device settings describe a tank (height, width, length, sensor distance)
+    tank_geometry: bool
+
+    @classmethod
+    def from_definition(cls, definition: Dict[str, Any]) -> GobzighModel:
+        """Build a model from a DEVICE_TYPES style definition."""
+        type_info = definition.get("type_info", {})
+        return cls(
+            code=definition["device_type_code"],
+            name=type_info.get("device_type_name", "Unknown"),
+            generation=type_info.get("device_generation", ""),
+            docs_url=definition.get("docs_url"),
+            sensors=tuple(definition.get("sensors", ())),
+            relay=bool(definition.get("relay", False)),
+            tank_geometry=bool(definition.get("tank_geometry", False)),
+        )
+
+
+# Indexed once at import; lazily loaded models are added on first lookup
+_MODELS: Dict[str, GobzighModel] = {
+    definition["device_type_code"]: GobzighModel.from_definition(definition)
+    for definition in DEVICE_TYPES
+}
+_LOADERS: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_model_loader(code: str, loader: Callable[[], Dict[str, Any]]) -> None:
+    """Register a model whose definition is only built when first needed."""
+    if code not in _MODELS:
+        _LOADERS[code] = loader
+
+
+def get_model(code: str | None) -> GobzighModel | None:
+    """Return the capabilities of a model code, or None if it is unknown."""
+    if not code:
+        return None
+    if (model := _MODELS.get(code)) is not None:
+        return model
+    if (loader := _LOADERS.pop(code, None)) is None:
+        return None
+    try:
+        model = GobzighModel.from_definition(loader())
+    except (KeyError, TypeError, ValueError) as err:
+        _LOGGER.error("Invalid definition for Gobzigh model %s: %s", code, err)
+        return None
+    _MODELS[code] = model
+    return model
+
+
+def model_names() -> Dict[str, str]:
+    """Return every model code with its friendly name, for selectors."""
+    for code in list(_LOADERS):
+        get_model(code)
+    return {code: model.name for code, model in _MODELS.items()}
+
+
+def device_has_relay(model: GobzighModel | None, device_data: Dict[str, Any]) -> bool:
+    """Return True if a device of this model is fitted with a relay."""
+    return bool(
+        model
+        and model.relay
+        and (device_data.get(ATTR_SETTINGS) or {}).get(SETTINGS_HAS_RELAY, False)
+    )
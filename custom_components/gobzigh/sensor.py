@@ -2,41 +2,199 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, Optional
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, UnitOfLength, UnitOfVolume
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers.typing import StateType
 
 from .const import (
     ATTR_CONSUMPTION,
-    ATTR_CONNECTION_STATUS,
-    ATTR_FIRMWARE_VERSION,
     ATTR_MODEL_NAME,
     ATTR_NEXT_FIRMWARE,
-    ATTR_ROOM_NAME,
     ATTR_SETTINGS,
     DOMAIN,
-    SETTINGS_HEIGHT,
-    SETTINGS_LENGTH,
-    SETTINGS_S_DIST,
-    SETTINGS_WIDTH,
+    UNIT_CENTIMETERS,
     UNIT_CUBIC_METERS,
     UNIT_METERS,
-    UNIT_PERCENTAGE,
+    UNIT_METERS_PER_HOUR,
 )
 from .coordinator import GobzighCoordinator
+from .entity import GobzighEntity
+from .metrics import GobzighDeviceMetrics
+from .models import get_model
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _rounded(value: float | None, digits: int) -> float | None:
+    """Round a metric that may be missing."""
+    return round(value, digits) if value is not None else None
+
+
+@dataclass(frozen=True, kw_only=True)
+class GobzighSensorEntityDescription(SensorEntityDescription):
+    """Describe a Gobzigh sensor.
+
+    ``name`` is appended to the device name (``None`` uses the device name
+    alone) and ``value_fn`` reads the device's precomputed metrics.
+    """
+
+    value_fn: Callable[[GobzighDeviceMetrics], StateType]
+    # Derived from sensor_val and subject to the device's write deadband
+    level_derived: bool = False
+    # Carries the device's shared state attributes
+    has_attributes: bool = False
+    # Fixed configuration: written only when it changes, kept out of statistics
+    static: bool = False
+
+
+SENSOR_DESCRIPTIONS: tuple[GobzighSensorEntityDescription, ...] = (
+    GobzighSensorEntityDescription(
+        key="level",
+        name=None,
+        native_unit_of_measurement=UNIT_CENTIMETERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.level,
+        level_derived=True,
+        has_attributes=True,
+    ),
+    GobzighSensorEntityDescription(
+        key="tank_height",
+        name="Height",
+        native_unit_of_measurement=UNIT_METERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda metrics: _rounded(metrics.tank_height, 2),
+        static=True,
+    ),
+    GobzighSensorEntityDescription(
+        key="tank_width",
+        name="Width",
+        native_unit_of_measurement=UNIT_METERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda metrics: _rounded(metrics.tank_width, 2),
+        static=True,
+    ),
+    GobzighSensorEntityDescription(
+        key="tank_length",
+        name="Length",
+        native_unit_of_measurement=UNIT_METERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda metrics: _rounded(metrics.tank_length, 2),
+        static=True,
+    ),
+    GobzighSensorEntityDescription(
+        key="sensor_distance",
+        name="Sensor Distance",
+        native_unit_of_measurement=UNIT_METERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda metrics: _rounded(metrics.sensor_distance, 2),
+        static=True,
+    ),
+    GobzighSensorEntityDescription(
+        key="water_height",
+        name="Water Height",
+        native_unit_of_measurement=UNIT_METERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: _rounded(metrics.water_height, 2),
+        level_derived=True,
+    ),
+    GobzighSensorEntityDescription(
+        key="current_volume",
+        name="Current Volume",
+        native_unit_of_measurement=UNIT_CUBIC_METERS,
+        device_class=SensorDeviceClass.VOLUME,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: _rounded(metrics.current_volume, 2),
+        level_derived=True,
+    ),
+    GobzighSensorEntityDescription(
+        key="max_volume",
+        name="Max Volume",
+        native_unit_of_measurement=UNIT_CUBIC_METERS,
+        device_class=SensorDeviceClass.VOLUME,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda metrics: _rounded(metrics.max_volume, 2),
+        static=True,
+    ),
+    GobzighSensorEntityDescription(
+        key="percentage",
+        name="Percentage",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: _rounded(metrics.percentage, 0),
+        level_derived=True,
+    ),
+    GobzighSensorEntityDescription(
+        key="connection",
+        name="Connected",
+        device_class=SensorDeviceClass.ENUM,
+        options=["connected", "disconnected"],
+        value_fn=lambda metrics: "connected" if metrics.connected else "disconnected",
+    ),
+    GobzighSensorEntityDescription(
+        key="fill_rate",
+        name="Fill Rate",
+        native_unit_of_measurement=UNIT_METERS_PER_HOUR,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:waves-arrow-up",
+        value_fn=lambda metrics: _rounded(metrics.fill_rate, 3),
+    ),
+    GobzighSensorEntityDescription(
+        key="smoothed_water_height",
+        name="Smoothed Water Height",
+        native_unit_of_measurement=UNIT_METERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: _rounded(metrics.smoothed_water_height, 2),
+    ),
+    GobzighSensorEntityDescription(
+        key="time_to_empty",
+        name="Time To Empty",
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        value_fn=lambda metrics: _rounded(metrics.time_to_empty, 1),
+    ),
+    GobzighSensorEntityDescription(
+        key="time_to_full",
+        name="Time To Full",
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        value_fn=lambda metrics: _rounded(metrics.time_to_full, 1),
+    ),
+)
+
+_DESCRIPTIONS_BY_KEY = {description.key: description for description in SENSOR_DESCRIPTIONS}
+
+# Sensor descriptions of each model, resolved on first use
+_MODEL_SENSORS: Dict[str, tuple[GobzighSensorEntityDescription, ...]] = {}
+
+
+def _model_sensors(model_name: str) -> tuple[GobzighSensorEntityDescription, ...]:
+    """Return the sensor descriptions of a model."""
+    if (descriptions := _MODEL_SENSORS.get(model_name)) is None:
+        model = get_model(model_name)
+        descriptions = _MODEL_SENSORS[model_name] = (
+            tuple(_DESCRIPTIONS_BY_KEY[key] for key in model.sensors) if model else ()
+        )
+    return descriptions
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -44,365 +202,121 @@ async def async_setup_entry(
 ) -> None:
     """Set up Gobzigh sensors."""
     coordinator: GobzighCoordinator = hass.data[DOMAIN][config_entry.entry_id]
-    
+
     entities: list[SensorEntity] = []
-    
+
     # Check if this is a device entry (has device_id) or main entry (has user_id only)
     if "device_id" in config_entry.data:
         # This is a device-specific entry
         device_id = config_entry.data["device_id"]
-        device_data = config_entry.data.get("device_data", {})
-        model_name = device_data.get("model_name", "")
-        
+        device_data = coordinator.data.get("device_data", {}).get(device_id) or {
+            "name": config_entry.title
+        }
+        model_name = config_entry.data.get(ATTR_MODEL_NAME) or device_data.get(ATTR_MODEL_NAME, "")
+
         # Add device to coordinator monitoring
         await coordinator.async_add_device(device_id)
-        
+
         # Create sensors based on device type
-        if model_name == "WLSV0":  # Liquid Level device
-            entities.extend(_create_liquid_level_sensors(coordinator, device_id, device_data))
-    
+        entities.extend(_create_device_sensors(coordinator, device_id, device_data, model_name))
+    else:
+        # Main entry: create entities for all adopted devices in one batch
+        added: set[str] = set()
+
+        @callback
+        def _async_add_adopted_devices() -> None:
+            """Add entities for devices adopted since the last update."""
+            new_entities: list[SensorEntity] = []
+            device_data = coordinator.data.get("device_data", {})
+            for device_id in coordinator.adopted_devices - added:
+                added.add(device_id)
+                record = device_data.get(device_id, {})
+                new_entities.extend(
+                    _create_device_sensors(
+                        coordinator, device_id, record, record.get(ATTR_MODEL_NAME, "")
+                    )
+                )
+            if new_entities:
+                async_add_entities(new_entities)
+
+        _async_add_adopted_devices()
+        config_entry.async_on_unload(coordinator.async_add_listener(_async_add_adopted_devices))
+
     async_add_entities(entities)
 
 
-def _create_liquid_level_sensors(
-    coordinator: GobzighCoordinator, device_id: str, device_data: Dict[str, Any]
+def _create_device_sensors(
+    coordinator: GobzighCoordinator,
+    device_id: str,
+    device_data: Dict[str, Any],
+    model_name: str,
 ) -> list[SensorEntity]:
-    """Create sensors for liquid level device."""
+    """Create the sensors of a device from its model's descriptions."""
     device_name = device_data.get("name", "Gobzigh Device")
-    
+
     return [
-        GobzighLiquidLevelSensor(coordinator, device_id, device_name),
-        GobzighTankHeightSensor(coordinator, device_id, device_name),
-        GobzighTankWidthSensor(coordinator, device_id, device_name),
-        GobzighTankLengthSensor(coordinator, device_id, device_name),
-        GobzighSensorDistanceSensor(coordinator, device_id, device_name),
-        GobzighWaterHeightSensor(coordinator, device_id, device_name),
-        GobzighCurrentVolumeSensor(coordinator, device_id, device_name),
-        GobzighMaxVolumeSensor(coordinator, device_id, device_name),
-        GobzighPercentageSensor(coordinator, device_id, device_name),
-        GobzighConnectionSensor(coordinator, device_id, device_name),
+        GobzighSensorEntity(coordinator, device_id, device_name, description)
+        for description in _model_sensors(model_name)
     ]
 
 
-class GobzighSensorEntity(CoordinatorEntity, SensorEntity):
-    """Base Gobzigh sensor entity."""
+class GobzighSensorEntity(GobzighEntity, SensorEntity):
+    """Gobzigh sensor entity."""
+
+    entity_description: GobzighSensorEntityDescription
+    # Bulky and covered elsewhere (statistics, device registry), keep out of the database
+    _unrecorded_attributes = frozenset({ATTR_SETTINGS, ATTR_CONSUMPTION, ATTR_NEXT_FIRMWARE})
 
     def __init__(
         self,
         coordinator: GobzighCoordinator,
         device_id: str,
         device_name: str,
-        sensor_type: str,
+        description: GobzighSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._device_id = device_id
-        self._device_name = device_name
-        self._sensor_type = sensor_type
-        self._attr_unique_id = f"{device_id}_{sensor_type}"
-
-    @property
-    def device_info(self) -> Dict[str, Any]:
-        """Return device information."""
-        device_data = self.coordinator.data.get("device_data", {}).get(self._device_id, {})
-        model_name = device_data.get(ATTR_MODEL_NAME, "Unknown")
-        firmware_version = device_data.get(ATTR_FIRMWARE_VERSION, "Unknown")
-        
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": self._device_name,
-            "manufacturer": "Gobzigh",
-            "model": model_name,
-            "sw_version": firmware_version,
-            "connections": {("mac", self._device_id)},
-        }
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return (
-            self.coordinator.last_update_success
-            and self._device_id in self.coordinator.data.get("device_data", {})
+        super().__init__(coordinator, device_id, device_name)
+        self.entity_description = description
+        self._attr_unique_id = f"{device_id}_{description.key}"
+        self._attr_name = (
+            f"{device_name} {description.name}" if description.name else device_name
         )
-
-    def _get_device_data(self) -> Dict[str, Any]:
-        """Get current device data."""
-        return self.coordinator.data.get("device_data", {}).get(self._device_id, {})
-
-
-class GobzighLiquidLevelSensor(GobzighSensorEntity):
-    """Gobzigh liquid level sensor."""
-
-    def __init__(self, coordinator: GobzighCoordinator, device_id: str, device_name: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, device_id, device_name, "level")
-        self._attr_name = f"{device_name}"
-        self._attr_native_unit_of_measurement = "cm"
-        self._attr_device_class = SensorDeviceClass.DISTANCE
-        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._static_written: tuple[StateType, bool] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the static value written when the entity is added."""
+        await super().async_added_to_hass()
+        if self.entity_description.static:
+            self._static_written = (self.native_value, self.available)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state unless nothing worth recording changed.
+
+        Level-derived sensors skip readings within the device deadband and
+        static sensors skip updates that leave their value unchanged.
+        """
+        description = self.entity_description
+        if description.level_derived and self.coordinator.is_level_write_suppressed(
+            self._device_id
+        ):
+            return
+        if description.static:
+            written = (self.native_value, self.available)
+            if written == self._static_written:
+                return
+            self._static_written = written
+        super()._handle_coordinator_update()
 
     @property
-    def native_value(self) -> float | None:
+    def native_value(self) -> StateType:
         """Return the state of the sensor."""
-        device_data = self._get_device_data()
-        sensor_val = device_data.get("sensor_val")
-        return float(sensor_val) if sensor_val is not None else None
+        metrics = self.coordinator.get_metrics(self._device_id)
+        return self.entity_description.value_fn(metrics) if metrics else None
 
     @property
     def extra_state_attributes(self) -> Dict[str, Any] | None:
         """Return additional state attributes."""
-        device_data = self._get_device_data()
-        return {
-            "relay_state": device_data.get("relay_state"),
-            "connection_status": device_data.get(ATTR_CONNECTION_STATUS),
-            "firmware_version": device_data.get(ATTR_FIRMWARE_VERSION),
-            "model_name": device_data.get(ATTR_MODEL_NAME),
-            "room_name": device_data.get(ATTR_ROOM_NAME),
-            "settings": device_data.get(ATTR_SETTINGS),
-            "consumption": device_data.get(ATTR_CONSUMPTION),
-            "next_firmware": device_data.get(ATTR_NEXT_FIRMWARE),
-        }
-
-
-class GobzighTankHeightSensor(GobzighSensorEntity):
-    """Tank height sensor."""
-
-    def __init__(self, coordinator: GobzighCoordinator, device_id: str, device_name: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, device_id, device_name, "tank_height")
-        self._attr_name = f"{device_name} Height"
-        self._attr_native_unit_of_measurement = UNIT_METERS
-        self._attr_device_class = SensorDeviceClass.DISTANCE
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the state of the sensor."""
-        device_data = self._get_device_data()
-        settings = device_data.get(ATTR_SETTINGS, {})
-        height = settings.get(SETTINGS_HEIGHT)
-        return round(float(height) / 100, 2) if height is not None else None
-
-
-class GobzighTankWidthSensor(GobzighSensorEntity):
-    """Tank width sensor."""
-
-    def __init__(self, coordinator: GobzighCoordinator, device_id: str, device_name: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, device_id, device_name, "tank_width")
-        self._attr_name = f"{device_name} Width"
-        self._attr_native_unit_of_measurement = UNIT_METERS
-        self._attr_device_class = SensorDeviceClass.DISTANCE
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the state of the sensor."""
-        device_data = self._get_device_data()
-        settings = device_data.get(ATTR_SETTINGS, {})
-        width = settings.get(SETTINGS_WIDTH)
-        return round(float(width) / 100, 2) if width is not None else None
-
-
-class GobzighTankLengthSensor(GobzighSensorEntity):
-    """Tank length sensor."""
-
-    def __init__(self, coordinator: GobzighCoordinator, device_id: str, device_name: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, device_id, device_name, "tank_length")
-        self._attr_name = f"{device_name} Length"
-        self._attr_native_unit_of_measurement = UNIT_METERS
-        self._attr_device_class = SensorDeviceClass.DISTANCE
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the state of the sensor."""
-        device_data = self._get_device_data()
-        settings = device_data.get(ATTR_SETTINGS, {})
-        length = settings.get(SETTINGS_LENGTH)
-        return round(float(length) / 100, 2) if length is not None else None
-
-
-class GobzighSensorDistanceSensor(GobzighSensorEntity):
-    """Sensor distance sensor."""
-
-    def __init__(self, coordinator: GobzighCoordinator, device_id: str, device_name: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, device_id, device_name, "sensor_distance")
-        self._attr_name = f"{device_name} Sensor Distance"
-        self._attr_native_unit_of_measurement = UNIT_METERS
-        self._attr_device_class = SensorDeviceClass.DISTANCE
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the state of the sensor."""
-        device_data = self._get_device_data()
-        settings = device_data.get(ATTR_SETTINGS, {})
-        s_dist = settings.get(SETTINGS_S_DIST)
-        return round(float(s_dist) / 100, 2) if s_dist is not None else None
-
-
-class GobzighWaterHeightSensor(GobzighSensorEntity):
-    """Water height sensor."""
-
-    def __init__(self, coordinator: GobzighCoordinator, device_id: str, device_name: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, device_id, device_name, "water_height")
-        self._attr_name = f"{device_name} Water Height"
-        self._attr_native_unit_of_measurement = UNIT_METERS
-        self._attr_device_class = SensorDeviceClass.DISTANCE
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the state of the sensor."""
-        device_data = self._get_device_data()
-        settings = device_data.get(ATTR_SETTINGS, {})
-        
-        sensor_val = device_data.get("sensor_val")
-        height = settings.get(SETTINGS_HEIGHT)
-        s_dist = settings.get(SETTINGS_S_DIST)
-        
-        if all(x is not None for x in [sensor_val, height, s_dist]):
-            tank_height = float(height) / 100  # Convert cm to m
-            sensor_distance = float(s_dist) / 100  # Convert cm to m
-            sensor_reading = float(sensor_val) / 100  # Convert cm to m
-            
-            water_height = tank_height + sensor_distance - sensor_reading
-            return round(max(0, water_height), 2)
-        
-        return None
-
-
-class GobzighCurrentVolumeSensor(GobzighSensorEntity):
-    """Current volume sensor."""
-
-    def __init__(self, coordinator: GobzighCoordinator, device_id: str, device_name: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, device_id, device_name, "current_volume")
-        self._attr_name = f"{device_name} Current Volume"
-        self._attr_native_unit_of_measurement = UNIT_CUBIC_METERS
-        self._attr_device_class = SensorDeviceClass.VOLUME
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the state of the sensor."""
-        device_data = self._get_device_data()
-        settings = device_data.get(ATTR_SETTINGS, {})
-        sensor_val = device_data.get("sensor_val")
-        
-        height = settings.get(SETTINGS_HEIGHT)
-        width = settings.get(SETTINGS_WIDTH)
-        length = settings.get(SETTINGS_LENGTH)
-        s_dist = settings.get(SETTINGS_S_DIST)
-        
-        if all(x is not None for x in [sensor_val, height, width, length, s_dist]):
-            # Calculate water height
-            tank_height = float(height) / 100
-            sensor_distance = float(s_dist) / 100
-            sensor_reading = float(sensor_val) / 100
-            water_height = max(0, tank_height + sensor_distance - sensor_reading)
-            
-            # Calculate volume
-            tank_width = float(width) / 100
-            tank_length = float(length) / 100
-            volume = water_height * tank_width * tank_length
-            return round(volume, 2)
-        
-        return None
-
-
-class GobzighMaxVolumeSensor(GobzighSensorEntity):
-    """Maximum volume sensor."""
-
-    def __init__(self, coordinator: GobzighCoordinator, device_id: str, device_name: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, device_id, device_name, "max_volume")
-        self._attr_name = f"{device_name} Max Volume"
-        self._attr_native_unit_of_measurement = UNIT_CUBIC_METERS
-        self._attr_device_class = SensorDeviceClass.VOLUME
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the state of the sensor."""
-        device_data = self._get_device_data()
-        settings = device_data.get(ATTR_SETTINGS, {})
-        
-        height = settings.get(SETTINGS_HEIGHT)
-        width = settings.get(SETTINGS_WIDTH)
-        length = settings.get(SETTINGS_LENGTH)
-        
-        if all(x is not None for x in [height, width, length]):
-            tank_height = float(height) / 100
-            tank_width = float(width) / 100
-            tank_length = float(length) / 100
-            volume = tank_height * tank_width * tank_length
-            return round(volume, 2)
-        
-        return None
-
-
-class GobzighPercentageSensor(GobzighSensorEntity):
-    """Percentage sensor."""
-
-    def __init__(self, coordinator: GobzighCoordinator, device_id: str, device_name: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, device_id, device_name, "percentage")
-        self._attr_name = f"{device_name} Percentage"
-        self._attr_native_unit_of_measurement = PERCENTAGE
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the state of the sensor."""
-        # Get current and max volume from other sensors
-        device_data = self._get_device_data()
-        settings = device_data.get(ATTR_SETTINGS, {})
-        sensor_val = device_data.get("sensor_val")
-        
-        height = settings.get(SETTINGS_HEIGHT)
-        width = settings.get(SETTINGS_WIDTH)
-        length = settings.get(SETTINGS_LENGTH)
-        s_dist = settings.get(SETTINGS_S_DIST)
-        
-        if all(x is not None for x in [sensor_val, height, width, length, s_dist]):
-            # Calculate current volume
-            tank_height = float(height) / 100
-            sensor_distance = float(s_dist) / 100
-            sensor_reading = float(sensor_val) / 100
-            water_height = max(0, tank_height + sensor_distance - sensor_reading)
-            
-            tank_width = float(width) / 100
-            tank_length = float(length) / 100
-            current_volume = water_height * tank_width * tank_length
-            
-            # Calculate max volume
-            max_volume = tank_height * tank_width * tank_length
-            
-            if max_volume > 0:
-                percentage = (current_volume / max_volume) * 100
-                return round(percentage, 0)
-        
-        return None
-
-
-class GobzighConnectionSensor(GobzighSensorEntity):
-    """Connection status sensor."""
-
-    def __init__(self, coordinator: GobzighCoordinator, device_id: str, device_name: str) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, device_id, device_name, "connection")
-        self._attr_name = f"{device_name} Connected"
-        self._attr_device_class = SensorDeviceClass.ENUM
-        self._attr_options = ["connected", "disconnected"]
-
-    @property
-    def native_value(self) -> str | None:
-        """Return the state of the sensor."""
-        device_data = self._get_device_data()
-        connection_status = device_data.get(ATTR_CONNECTION_STATUS)
-        return "connected" if connection_status else "disconnected"
+        if not self.entity_description.has_attributes:
+            return None
+        return self.coordinator.get_device_attributes(self._device_id)
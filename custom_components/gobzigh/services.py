@@ -0,0 +1,166 @@
+"""Services for the Gobzigh integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Any, Dict, List
+
+import aiohttp
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr, entity_registry as er
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DEVICE_DETAIL_URL,
+    DOMAIN,
+    HISTORY_METRICS,
+    HISTORY_RESOLUTION_DAY,
+    HISTORY_RESOLUTION_HOUR,
+    HISTORY_RESOLUTION_MINUTE,
+    PRIORITY_INTERACTIVE,
+    SERVICE_HISTORY,
+    SERVICE_REFRESH,
+)
+from .history import DATA_HISTORY
+from .hub import async_get_hub
+
+_RESOLUTIONS = {
+    "minute": HISTORY_RESOLUTION_MINUTE,
+    "hour": HISTORY_RESOLUTION_HOUR,
+    "day": HISTORY_RESOLUTION_DAY,
+}
+
+REFRESH_SCHEMA = vol.Schema(cv.TARGET_SERVICE_FIELDS)
+
+HISTORY_SCHEMA = vol.Schema(
+    {
+        **cv.TARGET_SERVICE_FIELDS,
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("resolution", default="auto"): vol.In(["auto", *_RESOLUTIONS]),
+        vol.Optional("metrics", default=list(HISTORY_METRICS)): vol.All(
+            cv.ensure_list, [vol.In(HISTORY_METRICS)]
+        ),
+    }
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Gobzigh services."""
+    if hass.services.has_service(DOMAIN, SERVICE_REFRESH):
+        return
+
+    async def _async_refresh(call: ServiceCall) -> ServiceResponse:
+        """Fetch the targeted devices now and update only their entities."""
+        device_ids = _async_target_device_ids(hass, call)
+        if not device_ids:
+            raise HomeAssistantError("No Gobzigh devices were targeted")
+
+        hub = async_get_hub(hass)
+        results = await asyncio.gather(
+            *(
+                hub.async_get_json(
+                    f"{DEVICE_DETAIL_URL}{device_id}",
+                    priority=PRIORITY_INTERACTIVE,
+                    fresh=True,
+                )
+                for device_id in device_ids
+            ),
+            return_exceptions=True,
+        )
+
+        records: List[Dict[str, Any]] = []
+        failed: List[str] = []
+        for device_id, result in zip(device_ids, results):
+            if isinstance(result, aiohttp.ClientError | asyncio.TimeoutError):
+                _LOGGER.warning("Failed to refresh device %s: %s", device_id, result)
+                failed.append(device_id)
+            elif isinstance(result, BaseException):
+                raise result
+            elif isinstance(result, list) and result and result[0].get("device_id"):
+                records.append(result[0])  # API returns list
+
+        # Merge into every coordinator that holds the device, account and device entries alike
+        updated = 0
+        for coordinator in hass.data.get(DOMAIN, {}).values():
+            own = [record for record in records if coordinator.has_device(record["device_id"])]
+            if own:
+                updated += await coordinator.async_apply_device_updates(own)
+
+        _LOGGER.debug(
+            "Refreshed %d Gobzigh devices, %d failed", len(records), len(failed)
+        )
+        if call.return_response:
+            return {"refreshed": len(records), "updated": updated, "failed": failed}
+        return None
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH,
+        _async_refresh,
+        schema=REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _async_history(call: ServiceCall) -> ServiceResponse:
+        """Return downsampled level history of the targeted devices."""
+        # The store lives as long as an entry is loaded; do not open a new one
+        if (store := hass.data.get(DATA_HISTORY)) is None:
+            raise ServiceValidationError("No Gobzigh entry is loaded")
+        device_ids = _async_target_device_ids(hass, call)
+        if not device_ids:
+            raise HomeAssistantError("No Gobzigh devices were targeted")
+
+        end = dt_util.as_utc(call.data["end"]) if "end" in call.data else dt_util.utcnow()
+        start = (
+            dt_util.as_utc(call.data["start"])
+            if "start" in call.data
+            else end - timedelta(days=1)
+        )
+        if start >= end:
+            raise HomeAssistantError("History start must be before its end")
+
+        return await store.async_query(
+            device_ids,
+            start.timestamp(),
+            end.timestamp(),
+            metrics=call.data["metrics"],
+            resolution=_RESOLUTIONS.get(call.data["resolution"]),
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_HISTORY,
+        _async_history,
+        schema=HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def _async_target_device_ids(hass: HomeAssistant, call: ServiceCall) -> List[str]:
+    """Resolve the device and entity targets of a call to Gobzigh device IDs."""
+    selected = async_extract_referenced_entity_ids(hass, call)
+    entity_registry = er.async_get(hass)
+    device_registry = dr.async_get(hass)
+
+    registry_device_ids = set(selected.referenced_devices)
+    for entity_id in selected.referenced | selected.indirectly_referenced:
+        entity = entity_registry.async_get(entity_id)
+        if entity is not None and entity.platform == DOMAIN and entity.device_id:
+            registry_device_ids.add(entity.device_id)
+
+    device_ids: set[str] = set()
+    for registry_device_id in registry_device_ids:
+        device = device_registry.async_get(registry_device_id)
+        if device is None:
+            continue
+        device_ids.update(
+            identifier for domain, identifier in device.identifiers if domain == DOMAIN
+        )
+    return sorted(device_ids)
@@ -2,17 +2,18 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict
+from typing import Any
 
 import aiohttp
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import GobzighCoordinator
+from .entity import GobzighEntity
+from .models import device_has_relay, get_model
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,20 +31,41 @@ async def async_setup_entry(
     # Check if this is a device entry
     if "device_id" in config_entry.data:
         device_id = config_entry.data["device_id"]
-        device_data = config_entry.data.get("device_data", {})
-        model_name = device_data.get("model_name", "")
-        device_name = device_data.get("name", "Gobzigh Device")
+        device_data = coordinator.data.get("device_data", {}).get(device_id, {})
+        model_name = config_entry.data.get("model_name") or device_data.get("model_name", "")
+        device_name = device_data.get("name", config_entry.title)
         
         # Create switch for devices that support relay control
-        if model_name == "WLSV0":  # Liquid Level device with relay
-            settings = device_data.get("settings", {})
-            if settings.get("has_relay", False):
-                entities.append(GobzighRelaySwitchEntity(coordinator, device_id, device_name))
+        if device_has_relay(get_model(model_name), device_data):
+            entities.append(GobzighRelaySwitchEntity(coordinator, device_id, device_name))
+    else:
+        # Main entry: create switches for all adopted devices in one batch
+        added: set[str] = set()
+
+        @callback
+        def _async_add_adopted_devices() -> None:
+            """Add switches for devices adopted since the last update."""
+            new_entities: list[SwitchEntity] = []
+            device_data = coordinator.data.get("device_data", {})
+            for device_id in coordinator.adopted_devices - added:
+                added.add(device_id)
+                record = device_data.get(device_id, {})
+                if device_has_relay(get_model(record.get("model_name")), record):
+                    new_entities.append(
+                        GobzighRelaySwitchEntity(
+                            coordinator, device_id, record.get("name", "Gobzigh Device")
+                        )
+                    )
+            if new_entities:
+                async_add_entities(new_entities)
+
+        _async_add_adopted_devices()
+        config_entry.async_on_unload(coordinator.async_add_listener(_async_add_adopted_devices))
     
     async_add_entities(entities)
 
 
-class GobzighRelaySwitchEntity(CoordinatorEntity, SwitchEntity):
+class GobzighRelaySwitchEntity(GobzighEntity, SwitchEntity):
     """Gobzigh relay switch entity."""
 
     def __init__(
@@ -53,36 +75,10 @@ class GobzighRelaySwitchEntity(CoordinatorEntity, SwitchEntity):
         device_name: str,
     ) -> None:
         """Initialize the switch."""
-        super().__init__(coordinator)
-        self._device_id = device_id
-        self._device_name = device_name
+        super().__init__(coordinator, device_id, device_name)
         self._attr_unique_id = f"{device_id}_switch"
         self._attr_name = f"{device_name} Switch"
 
-    @property
-    def device_info(self) -> Dict[str, Any]:
-        """Return device information."""
-        device_data = self.coordinator.data.get("device_data", {}).get(self._device_id, {})
-        model_name = device_data.get("model_name", "Unknown")
-        firmware_version = device_data.get("firmware_version", "Unknown")
-        
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": self._device_name,
-            "manufacturer": "Gobzigh",
-            "model": model_name,
-            "sw_version": firmware_version,
-            "connections": {("mac", self._device_id)},
-        }
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return (
-            self.coordinator.last_update_success
-            and self._device_id in self.coordinator.data.get("device_data", {})
-        )
-
     @property
     def is_on(self) -> bool | None:
         """Return true if the switch is on."""
@@ -108,14 +104,14 @@ class GobzighRelaySwitchEntity(CoordinatorEntity, SwitchEntity):
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload, timeout=30) as response:
-                    response.raise_for_status()
-                    _LOGGER.debug("Successfully set relay state for device %s to %s", 
-                                self._device_id, state)
-                    
-                    # Request immediate refresh to update state
-                    await self.coordinator.async_request_refresh()
+            await self.coordinator.hub.async_post_json(
+                url, payload, transport=self.coordinator.transport
+            )
+            _LOGGER.debug("Successfully set relay state for device %s to %s", 
+                        self._device_id, state)
+            
+            # Request immediate refresh to update state
+            await self.coordinator.async_request_refresh()
                     
         except aiohttp.ClientError as err:
             _LOGGER.error("Failed to set relay state for device %s: %s", 
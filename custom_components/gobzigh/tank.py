@@ -0,0 +1,187 @@
+"""Level to volume conversion for Gobzigh tanks of different shapes."""
+from __future__ import annotations
+
+import math
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+from .const import (
+    CONF_CONE_HEIGHT,
+    CONF_STRAPPING_TABLE,
+    CONF_TANK_SHAPE,
+    TANK_SHAPE_CONE_BOTTOM,
+    TANK_SHAPE_HORIZONTAL_CYLINDER,
+    TANK_SHAPE_RECTANGULAR,
+    TANK_SHAPE_STRAPPING,
+    TANK_SHAPE_VERTICAL_CYLINDER,
+    TANK_TABLE_POINTS,
+)
+
+
+def parse_strapping_table(text: str) -> tuple[tuple[float, float], ...]:
+    """Parse ``height_cm:liters`` pairs separated by commas or new lines.
+
+    Raises ValueError when a pair is malformed or the heights and volumes
+    are not both increasing.
+    """
+    points: list[tuple[float, float]] = []
+    for item in text.replace("\n", ",").split(","):
+        if not (item := item.strip()):
+            continue
+        height, _, volume = item.partition(":")
+        points.append((float(height), float(volume)))
+
+    points.sort()
+    if len(points) < 2:
+        raise ValueError("at least two points are needed")
+    for (h1, v1), (h2, v2) in zip(points, points[1:]):
+        if h2 <= h1 or v2 < v1:
+            raise ValueError("heights must be distinct and volumes must not decrease")
+    return tuple(points)
+
+
+@dataclass(frozen=True, slots=True)
+class TankShapeConfig:
+    """Shape settings of a device's tank."""
+
+    shape: str = TANK_SHAPE_RECTANGULAR
+    cone_height: float = 0.0  # m
+    strapping: tuple[tuple[float, float], ...] = ()  # (water height m, volume m³)
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> TankShapeConfig:
+        """Build the settings from config entry options."""
+        shape = options.get(CONF_TANK_SHAPE, TANK_SHAPE_RECTANGULAR)
+        strapping: tuple[tuple[float, float], ...] = ()
+        if shape == TANK_SHAPE_STRAPPING:
+            try:
+                strapping = tuple(
+                    (height / 100, liters / 1000)
+                    for height, liters in parse_strapping_table(
+                        options.get(CONF_STRAPPING_TABLE, "")
+                    )
+                )
+            except ValueError:
+                shape = TANK_SHAPE_RECTANGULAR
+        return cls(
+            shape=shape,
+            cone_height=float(options.get(CONF_CONE_HEIGHT, 0.0)) / 100,
+            strapping=strapping,
+        )
+
+
+class CompiledTank:
+    """A device's tank shape and its volume table, kept by its coordinator.
+
+    The table is compiled on first use and again only when the tank's
+    dimensions change, however many devices the fleet has.
+    """
+
+    __slots__ = ("config", "_compiled")
+
+    def __init__(self, config: TankShapeConfig) -> None:
+        """Initialize the tank."""
+        self.config = config
+        # ((height, width, length), table), replaced as one value
+        self._compiled: tuple[tuple[Any, ...], VolumeTable | None] | None = None
+
+    def table(
+        self,
+        tank_height: float | None,
+        tank_width: float | None,
+        tank_length: float | None,
+    ) -> VolumeTable | None:
+        """Return the volume table for the tank's current dimensions."""
+        dimensions = (tank_height, tank_width, tank_length)
+        compiled = self._compiled
+        if compiled is None or compiled[0] != dimensions:
+            compiled = self._compiled = (
+                dimensions,
+                compile_volume_table(self.config, *dimensions),
+            )
+        return compiled[1]
+
+
+class VolumeTable:
+    """Piecewise-linear water height to volume lookup."""
+
+    __slots__ = ("_heights", "_volumes", "max_volume")
+
+    def __init__(self, points: tuple[tuple[float, float], ...]) -> None:
+        """Initialize the table from increasing (height, volume) points."""
+        self._heights = tuple(height for height, _ in points)
+        self._volumes = tuple(volume for _, volume in points)
+        self.max_volume = self._volumes[-1]
+
+    def volume(self, water_height: float) -> float:
+        """Return the volume at a water height, clamped to the table."""
+        heights = self._heights
+        index = bisect_right(heights, water_height)
+        if index == 0:
+            return self._volumes[0]
+        if index == len(heights):
+            return self.max_volume
+        h1, h2 = heights[index - 1], heights[index]
+        v1, v2 = self._volumes[index - 1], self._volumes[index]
+        return v1 + (v2 - v1) * (water_height - h1) / (h2 - h1)
+
+
+def _horizontal_cylinder(diameter: float, length: float, height: float) -> float:
+    """Return the volume of a horizontal cylinder filled to a height."""
+    radius = diameter / 2
+    depth = radius - height
+    segment = radius * radius * math.acos(depth / radius) - depth * math.sqrt(
+        max(0.0, 2 * radius * height - height * height)
+    )
+    return length * segment
+
+
+def _cone_bottom(diameter: float, cone_height: float, height: float) -> float:
+    """Return the volume of a vertical cylinder with a conical bottom."""
+    area = math.pi * diameter * diameter / 4
+    if height <= cone_height:
+        return area * height**3 / (3 * cone_height * cone_height)
+    return area * (cone_height / 3 + height - cone_height)
+
+
+def compile_volume_table(
+    config: TankShapeConfig,
+    tank_height: float | None,
+    tank_width: float | None,
+    tank_length: float | None,
+) -> VolumeTable | None:
+    """Compile a tank's shape into a lookup table.
+
+    Dimensions are in meters. Returns None when the shape is missing the
+    dimensions it needs.
+    """
+    if config.shape == TANK_SHAPE_STRAPPING:
+        return VolumeTable(config.strapping) if config.strapping else None
+    if not tank_height:
+        return None
+
+    if config.shape == TANK_SHAPE_VERTICAL_CYLINDER and tank_width:
+        area = math.pi * tank_width * tank_width / 4
+        return VolumeTable(((0.0, 0.0), (tank_height, area * tank_height)))
+    if config.shape == TANK_SHAPE_HORIZONTAL_CYLINDER and tank_length:
+
+        def volume_at(height: float) -> float:
+            return _horizontal_cylinder(tank_height, tank_length, height)
+
+    elif config.shape == TANK_SHAPE_CONE_BOTTOM and tank_width and config.cone_height > 0:
+        cone_height = min(config.cone_height, tank_height)
+
+        def volume_at(height: float) -> float:
+            return _cone_bottom(tank_width, cone_height, height)
+
+    else:
+        return None
+
+    step = tank_height / (TANK_TABLE_POINTS - 1)
+    return VolumeTable(
+        tuple(
+            (index * step, volume_at(index * step))
+            for index in range(TANK_TABLE_POINTS)
+        )
+    )
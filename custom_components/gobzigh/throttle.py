@@ -0,0 +1,90 @@
+"""State write suppression for level-derived Gobzigh sensors."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+from .const import (
+    CONF_DEADBAND_ABS,
+    CONF_DEADBAND_PCT,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_MIN_WRITE_INTERVAL,
+    DEFAULT_DEADBAND_ABS,
+    DEFAULT_DEADBAND_PCT,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_MIN_WRITE_INTERVAL,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class LevelWriteConfig:
+    """Deadband settings of a device."""
+
+    deadband_abs: float = DEFAULT_DEADBAND_ABS  # cm of sensor reading
+    deadband_pct: float = DEFAULT_DEADBAND_PCT  # % of tank height
+    min_interval: float = DEFAULT_MIN_WRITE_INTERVAL  # seconds
+    heartbeat: float = DEFAULT_HEARTBEAT_INTERVAL  # seconds
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> LevelWriteConfig:
+        """Build the settings from config entry options."""
+        return cls(
+            deadband_abs=float(options.get(CONF_DEADBAND_ABS, DEFAULT_DEADBAND_ABS)),
+            deadband_pct=float(options.get(CONF_DEADBAND_PCT, DEFAULT_DEADBAND_PCT)),
+            min_interval=float(options.get(CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL)),
+            heartbeat=float(options.get(CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL)),
+        )
+
+
+class LevelWriteGate:
+    """Decide whether a new level reading is worth writing.
+
+    One gate is kept per device and evaluated once per data update, so the
+    level, water height, current volume and percentage sensors of a device
+    always write (or skip) together.
+    """
+
+    __slots__ = ("_last_value", "_last_write", "_force", "suppressed")
+
+    def __init__(self) -> None:
+        """Initialize the gate."""
+        self._last_value: float | None = None
+        self._last_write: float = 0.0
+        self._force = True
+        self.suppressed = False
+
+    def force_next(self) -> None:
+        """Make the next evaluation write unconditionally."""
+        self._force = True
+
+    def evaluate(
+        self,
+        value: float | None,
+        tank_height: float | None,
+        config: LevelWriteConfig,
+        now: float,
+    ) -> bool:
+        """Evaluate a reading and return True when it should be written."""
+        elapsed = now - self._last_write
+
+        if (
+            self._force
+            or value is None
+            or self._last_value is None
+            or elapsed >= config.heartbeat
+        ):
+            write = True
+        elif elapsed < config.min_interval:
+            write = False
+        else:
+            threshold = config.deadband_abs
+            if tank_height:
+                threshold = max(threshold, tank_height * config.deadband_pct / 100)
+            write = abs(value - self._last_value) >= threshold
+
+        if write:
+            self._last_value = value
+            self._last_write = now
+            self._force = False
+        self.suppressed = not write
+        return write
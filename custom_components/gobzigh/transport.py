@@ -0,0 +1,334 @@
+"""Request transports for the Gobzigh API: live, captured and replayed."""
+from __future__ import annotations
+
+import asyncio
+import codecs
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Mapping, Tuple
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    API_TIMEOUT,
+    CONF_REPLAY_SPEED,
+    CONF_TRANSPORT,
+    CONF_TRANSPORT_FILE,
+    DEFAULT_REPLAY_SPEED,
+    DEFAULT_TRANSPORT_FILE,
+    PAYLOAD_EXECUTOR_THRESHOLD,
+    TRANSPORT_CAPTURE,
+    TRANSPORT_REPLAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Status recorded for requests that failed without an HTTP response
+CAPTURE_NETWORK_ERROR = 599
+
+# Bytes read from a response body at a time
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Only offer brotli when a decoder is installed for aiohttp to use
+try:
+    import brotlicffi  # noqa: F401
+except ImportError:
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+    else:
+        ACCEPT_ENCODING = "gzip, deflate, br"
+else:
+    ACCEPT_ENCODING = "gzip, deflate, br"
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+class JsonArrayStream:
+    """Decode a JSON array element by element as its text arrives.
+
+    ``feed`` returns the elements completed by each piece of text, so only
+    the unfinished tail of the body is ever buffered. A body that is not an
+    array is buffered whole and decoded by ``result``.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the decoder."""
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        # "start", "first" (after "["), "item", "next" (after an item), "done" or "other"
+        self._state = "start"
+
+    def feed(self, text: str) -> List[Any]:
+        """Add text and return the array elements it completed."""
+        buffer = self._buffer + text
+        items: List[Any] = []
+        pos = 0
+        end = len(buffer)
+        while self._state not in ("done", "other"):
+            while pos < end and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == end:
+                break
+            char = buffer[pos]
+            if self._state == "start":
+                if char != "[":
+                    self._state = "other"
+                    break
+                self._state = "first"
+                pos += 1
+            elif self._state == "next":
+                if char not in ",]":
+                    raise ValueError(f"Expected ',' or ']' at {char!r}")
+                self._state = "item" if char == "," else "done"
+                pos += 1
+            elif self._state == "first" and char == "]":
+                self._state = "done"
+                pos += 1
+            else:
+                try:
+                    item, item_end = self._decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    break  # element continues in the next chunk
+                if item_end == end or buffer[item_end] not in _DELIMITERS:
+                    break  # a number may still have digits to come
+                items.append(item)
+                self._state = "next"
+                pos = item_end
+        self._buffer = buffer[pos:]
+        return items
+
+    def result(self, items: List[Any]) -> Any:
+        """Return the decoded body, given every element ``feed`` returned."""
+        if self._state == "other":
+            return json.loads(self._buffer)
+        # A trailing element is only complete once its closing bracket is read
+        items.extend(self.feed(""))
+        if self._state != "done" or self._buffer.strip():
+            raise ValueError("Truncated or trailing data after JSON array")
+        return items
+
+
+class GobzighTransport:
+    """Carry one API request and return its decoded JSON body."""
+
+    async def async_request(
+        self, method: str, url: str, payload: Dict[str, Any] | None = None
+    ) -> Any:
+        """Perform a request."""
+        raise NotImplementedError
+
+    async def async_close(self) -> None:
+        """Release anything held by the transport."""
+
+
+class HttpTransport(GobzighTransport):
+    """Talk to the Gobzigh cloud over the shared client session."""
+
+    def __init__(self, hass: HomeAssistant, session: aiohttp.ClientSession) -> None:
+        """Initialize the transport."""
+        self._hass = hass
+        self._session = session
+
+    async def async_request(
+        self, method: str, url: str, payload: Dict[str, Any] | None = None
+    ) -> Any:
+        """Perform a request; commands return no body.
+
+        Bodies arrive compressed when the server supports it and are decoded
+        chunk by chunk, so a device list of thousands of records is never
+        held as one string. The decoded records are still collected into one
+        list, because the coordinator keeps the whole account list: peak
+        memory is that list plus one chunk of text, not one record. Once a
+        body passes ``PAYLOAD_EXECUTOR_THRESHOLD`` its remaining chunks are
+        decoded in the executor.
+        """
+        async with self._session.request(
+            method,
+            url,
+            json=payload,
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
+            timeout=aiohttp.ClientTimeout(total=API_TIMEOUT),
+        ) as response:
+            response.raise_for_status()
+            if method != "GET":
+                return None
+
+            text = codecs.getincrementaldecoder(response.charset or "utf-8")()
+            stream = JsonArrayStream()
+            items: List[Any] = []
+            received = 0
+            loop_time = executor_time = 0.0
+
+            def _feed(chunk: bytes, final: bool = False) -> List[Any]:
+                return stream.feed(text.decode(chunk, final))
+
+            try:
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    received += len(chunk)
+                    started = time.perf_counter()
+                    if received > PAYLOAD_EXECUTOR_THRESHOLD:
+                        items.extend(await self._hass.async_add_executor_job(_feed, chunk))
+                        executor_time += time.perf_counter() - started
+                    else:
+                        items.extend(_feed(chunk))
+                        loop_time += time.perf_counter() - started
+                items.extend(_feed(b"", True))
+                body = stream.result(items)
+            except ValueError as err:
+                raise aiohttp.ClientPayloadError(f"Invalid JSON from {url}: {err}") from err
+
+        if received > PAYLOAD_EXECUTOR_THRESHOLD:
+            _LOGGER.debug(
+                "Decoded %d bytes from %s: %.1f ms on the event loop, %.1f ms in the executor",
+                received,
+                url,
+                loop_time * 1000,
+                executor_time * 1000,
+            )
+        return body
+
+
+class CaptureTransport(GobzighTransport):
+    """Record every request of another transport to a JSONL file.
+
+    Each line holds the offset from the first request (``t``), the request
+    latency in milliseconds (``ms``), the method, URL, status and decoded
+    body, which is exactly what ``ReplayTransport`` reads back.
+    """
+
+    def __init__(self, hass: HomeAssistant, inner: GobzighTransport, path: str) -> None:
+        """Initialize the transport."""
+        self._hass = hass
+        self._inner = inner
+        self._path = path
+        self._started: float | None = None
+        self._write_lock = asyncio.Lock()
+
+    async def async_request(
+        self, method: str, url: str, payload: Dict[str, Any] | None = None
+    ) -> Any:
+        """Perform a request through the wrapped transport and record it."""
+        now = time.monotonic()
+        if self._started is None:
+            self._started = now
+        try:
+            body = await self._inner.async_request(method, url, payload)
+        except aiohttp.ClientResponseError as err:
+            await self._async_record(now, method, url, err.status, None)
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            # Replayed as a failed request like any other error status
+            await self._async_record(now, method, url, CAPTURE_NETWORK_ERROR, None)
+            raise
+        await self._async_record(now, method, url, 200, body)
+        return body
+
+    async def _async_record(
+        self, started: float, method: str, url: str, status: int, body: Any
+    ) -> None:
+        """Write one request to the capture file, in request order."""
+        line = json.dumps(
+            {
+                "t": round(started - (self._started or started), 3),
+                "ms": round((time.monotonic() - started) * 1000, 1),
+                "method": method,
+                "url": url,
+                "status": status,
+                "body": body,
+            },
+            separators=(",", ":"),
+        )
+        async with self._write_lock:
+            await self._hass.async_add_executor_job(self._append, line)
+
+    def _append(self, line: str) -> None:
+        """Append one record to the capture file."""
+        with open(self._path, "a", encoding="utf-8") as file:
+            file.write(line + "\n")
+
+
+def load_recording(path: str) -> Dict[Tuple[str, str], Deque[Dict[str, Any]]]:
+    """Load a JSONL recording into per request queues, in file order."""
+    responses: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = {}
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if not (line := line.strip()):
+                continue
+            record = json.loads(line)
+            responses.setdefault(
+                (record.get("method", "GET"), record["url"]), deque()
+            ).append(record)
+    return responses
+
+
+class ReplayTransport(GobzighTransport):
+    """Answer requests from a recording instead of the network.
+
+    Responses to the same request are returned in recorded order, each held
+    back until its recorded offset divided by ``speed`` has passed; a speed
+    of 0 replays as fast as requests arrive. Once a request's recording runs
+    out, its last response keeps being returned.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str, speed: float) -> None:
+        """Initialize the transport."""
+        self._hass = hass
+        self._path = path
+        self._speed = speed
+        self._responses: Dict[Tuple[str, str], Deque[Dict[str, Any]]] | None = None
+        self._load_lock = asyncio.Lock()
+        self._started = 0.0
+
+    async def async_request(
+        self, method: str, url: str, payload: Dict[str, Any] | None = None
+    ) -> Any:
+        """Return the next recorded response for the request."""
+        if self._responses is None:
+            async with self._load_lock:
+                if self._responses is None:
+                    self._responses = await self._hass.async_add_executor_job(
+                        load_recording, self._path
+                    )
+                    self._started = time.monotonic()
+                    _LOGGER.debug(
+                        "Replaying %d recorded requests from %s",
+                        sum(len(queue) for queue in self._responses.values()),
+                        self._path,
+                    )
+
+        queue = self._responses.get((method, url))
+        if not queue:
+            raise aiohttp.ClientError(f"No recorded response for {method} {url}")
+        record = queue.popleft() if len(queue) > 1 else queue[0]
+
+        if self._speed > 0:
+            due = self._started + (record.get("t", 0) + record.get("ms", 0) / 1000) / self._speed
+            if (delay := due - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+
+        if (status := record.get("status", 200)) >= 400:
+            raise aiohttp.ClientError(f"Recorded HTTP {status} for {method} {url}")
+        return record.get("body")
+
+
+def async_create_transport(
+    hass: HomeAssistant, http: GobzighTransport, options: Mapping[str, Any]
+) -> GobzighTransport:
+    """Return the transport selected in an account's options."""
+    mode = options.get(CONF_TRANSPORT)
+    if mode not in (TRANSPORT_CAPTURE, TRANSPORT_REPLAY):
+        return http
+
+    path = hass.config.path(options.get(CONF_TRANSPORT_FILE) or DEFAULT_TRANSPORT_FILE)
+    if mode == TRANSPORT_CAPTURE:
+        _LOGGER.info("Capturing Gobzigh API responses to %s", path)
+        return CaptureTransport(hass, http, path)
+    speed = float(options.get(CONF_REPLAY_SPEED, DEFAULT_REPLAY_SPEED))
+    _LOGGER.info("Replaying Gobzigh API responses from %s at %sx", path, speed)
+    return ReplayTransport(hass, path, speed)
@@ -0,0 +1,147 @@
+"""Streaming fill/drain statistics for Gobzigh liquid level devices."""
+from __future__ import annotations
+
+from array import array
+
+from .const import (
+    TREND_MIN_SPAN,
+    TREND_RATE_EPSILON,
+    TREND_SMOOTHING,
+    TREND_WINDOW_SIZE,
+)
+
+
+class LevelTrend:
+    """Rolling level statistics over a fixed window of recent samples.
+
+    Samples live in two preallocated ``array('d')`` ring buffers and the
+    least-squares sums are maintained as samples enter and leave the window,
+    so each update is O(1) and memory per device is constant. Timestamps are
+    stored relative to a moving origin that is re-based once per window to
+    keep the running sums numerically stable.
+    """
+
+    __slots__ = (
+        "_times",
+        "_heights",
+        "_capacity",
+        "_start",
+        "_count",
+        "_origin",
+        "_since_rebase",
+        "_sum_t",
+        "_sum_h",
+        "_sum_tt",
+        "_sum_th",
+        "smoothed",
+        "latest",
+    )
+
+    def __init__(self, capacity: int = TREND_WINDOW_SIZE) -> None:
+        """Initialize an empty window."""
+        self._times = array("d", [0.0]) * capacity
+        self._heights = array("d", [0.0]) * capacity
+        self._capacity = capacity
+        self._start = 0
+        self._count = 0
+        self._origin = 0.0
+        self._since_rebase = 0
+        self._sum_t = 0.0
+        self._sum_h = 0.0
+        self._sum_tt = 0.0
+        self._sum_th = 0.0
+        self.smoothed: float | None = None
+        self.latest: float | None = None
+
+    def add(self, timestamp: float, height: float) -> None:
+        """Add a sample, evicting the oldest one when the window is full."""
+        if self._count and timestamp <= self._last_timestamp:
+            return
+        if not self._count:
+            self._origin = timestamp
+
+        t = timestamp - self._origin
+        if self._count == self._capacity:
+            old_t = self._times[self._start]
+            old_h = self._heights[self._start]
+            self._sum_t -= old_t
+            self._sum_h -= old_h
+            self._sum_tt -= old_t * old_t
+            self._sum_th -= old_t * old_h
+            index = self._start
+            self._start = (self._start + 1) % self._capacity
+        else:
+            index = (self._start + self._count) % self._capacity
+            self._count += 1
+
+        self._times[index] = t
+        self._heights[index] = height
+        self._sum_t += t
+        self._sum_h += height
+        self._sum_tt += t * t
+        self._sum_th += t * height
+
+        self.latest = height
+        if self.smoothed is None:
+            self.smoothed = height
+        else:
+            self.smoothed += TREND_SMOOTHING * (height - self.smoothed)
+
+        self._since_rebase += 1
+        if self._since_rebase >= self._capacity:
+            self._rebase()
+
+    @property
+    def _last_timestamp(self) -> float:
+        """Return the absolute timestamp of the newest sample."""
+        index = (self._start + self._count - 1) % self._capacity
+        return self._times[index] + self._origin
+
+    def _rebase(self) -> None:
+        """Move the origin to the oldest sample and recompute the sums."""
+        shift = self._times[self._start]
+        self._origin += shift
+        self._sum_t = self._sum_h = self._sum_tt = self._sum_th = 0.0
+        for offset in range(self._count):
+            index = (self._start + offset) % self._capacity
+            t = self._times[index] - shift
+            h = self._heights[index]
+            self._times[index] = t
+            self._sum_t += t
+            self._sum_h += h
+            self._sum_tt += t * t
+            self._sum_th += t * h
+        self._since_rebase = 0
+
+    @property
+    def rate(self) -> float | None:
+        """Return the least-squares fill rate in meters per hour."""
+        if self._count < 2:
+            return None
+        newest = (self._start + self._count - 1) % self._capacity
+        if self._times[newest] - self._times[self._start] < TREND_MIN_SPAN:
+            return None
+        denominator = self._count * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return None
+        slope = (self._count * self._sum_th - self._sum_t * self._sum_h) / denominator
+        return slope * 3600
+
+    def time_to_empty(self) -> float | None:
+        """Return the hours until the tank is empty at the current drain rate."""
+        rate = self.rate
+        if rate is None or rate > -TREND_RATE_EPSILON or self.smoothed is None:
+            return None
+        return self.smoothed / -rate
+
+    def time_to_full(self, tank_height: float | None) -> float | None:
+        """Return the hours until the tank is full at the current fill rate."""
+        rate = self.rate
+        if (
+            rate is None
+            or rate < TREND_RATE_EPSILON
+            or self.smoothed is None
+            or not tank_height
+        ):
+            return None
+        return max(0.0, tank_height - self.smoothed) / rate
@@ -0,0 +1,153 @@
+"""Push webhook for cloud-initiated Gobzigh device updates."""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import logging
+import time
+from typing import Any, Dict, List
+
+from aiohttp import web
+from homeassistant.components import webhook
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_USER_ID,
+    CONF_WEBHOOK_ID,
+    CONF_WEBHOOK_SECRET,
+    DOMAIN,
+    WEBHOOK_EXECUTOR_THRESHOLD,
+    WEBHOOK_MAX_AGE,
+    WEBHOOK_SIGNATURE_HEADER,
+    WEBHOOK_TIMESTAMP_HEADER,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SEEN_SIGNATURES = f"{DOMAIN}_seen_signatures"
+
+
+async def async_setup_webhook(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Register the push webhook for a main integration entry."""
+    webhook_id = entry.data.get(CONF_WEBHOOK_ID)
+    if not webhook_id:
+        webhook_id = webhook.async_generate_id()
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_WEBHOOK_ID: webhook_id}
+        )
+
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        f"Gobzigh {entry.data[CONF_USER_ID]}",
+        webhook_id,
+        _async_handle_webhook,
+        allowed_methods=["POST"],
+    )
+    _LOGGER.debug("Registered Gobzigh push webhook for entry %s", entry.entry_id)
+
+
+def async_unload_webhook(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Unregister the push webhook of a main integration entry."""
+    if webhook_id := entry.data.get(CONF_WEBHOOK_ID):
+        webhook.async_unregister(hass, webhook_id)
+
+
+def async_get_webhook_url(hass: HomeAssistant, entry: ConfigEntry) -> str | None:
+    """Return the external URL of the push webhook, if registered."""
+    if webhook_id := entry.data.get(CONF_WEBHOOK_ID):
+        return webhook.async_generate_url(hass, webhook_id)
+    return None
+
+
+def _decode_payload(body: bytes) -> List[Dict[str, Any]]:
+    """Decode a pushed payload into a list of device records.
+
+    Accepts the same shape as the user device list, either bare or wrapped
+    in a ``{"devices": [...]}`` object.
+    """
+    payload = json.loads(body)
+    if isinstance(payload, dict):
+        payload = payload.get("devices")
+    if not isinstance(payload, list):
+        raise ValueError("Payload must be a list of device records")
+    return [record for record in payload if isinstance(record, dict)]
+
+
+async def _async_handle_webhook(
+    hass: HomeAssistant, webhook_id: str, request: web.Request
+) -> web.Response:
+    """Handle a batch of pushed device records."""
+    entry = next(
+        (
+            entry
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.data.get(CONF_WEBHOOK_ID) == webhook_id
+        ),
+        None,
+    )
+    coordinators = hass.data.get(DOMAIN, {})
+    if entry is None or entry.entry_id not in coordinators:
+        return web.Response(status=404)
+
+    # Unsigned pushes are never accepted; the secret is read live from options
+    secret = entry.options.get(CONF_WEBHOOK_SECRET)
+    if not secret:
+        _LOGGER.debug("Rejected push for %s: no webhook secret configured", entry.entry_id)
+        return web.Response(status=403)
+
+    # The signature covers the timestamp, so a captured push cannot be replayed later
+    body = await request.read()
+    timestamp = request.headers.get(WEBHOOK_TIMESTAMP_HEADER, "")
+    expected = hmac.new(
+        secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256
+    ).hexdigest()
+    signature = request.headers.get(WEBHOOK_SIGNATURE_HEADER, "").lower()
+    # compare_digest only takes ASCII strings; anything else cannot be a hex digest
+    if not signature.isascii() or not hmac.compare_digest(signature, expected):
+        _LOGGER.warning("Rejected Gobzigh push with an invalid signature")
+        return web.Response(status=401)
+
+    now = time.time()
+    try:
+        age = abs(now - float(timestamp))
+    except ValueError:
+        age = float("inf")
+    if age > WEBHOOK_MAX_AGE:
+        _LOGGER.warning("Rejected Gobzigh push signed %s, outside the accepted window", timestamp)
+        return web.Response(status=401)
+
+    # Within the window each signed push is accepted once
+    seen: Dict[str, float] = hass.data.setdefault(DATA_SEEN_SIGNATURES, {})
+    for old_signature in [key for key, expires in seen.items() if expires <= now]:
+        del seen[old_signature]
+    if signature in seen:
+        _LOGGER.warning("Rejected a repeated Gobzigh push")
+        return web.Response(status=409)
+    seen[signature] = now + WEBHOOK_MAX_AGE
+
+    try:
+        if len(body) >= WEBHOOK_EXECUTOR_THRESHOLD:
+            records = await hass.async_add_executor_job(_decode_payload, body)
+        else:
+            records = _decode_payload(body)
+    except ValueError as err:
+        _LOGGER.warning("Rejected malformed Gobzigh push: %s", err)
+        return web.Response(status=400)
+
+    # Index once so each device coordinator only sees its own record
+    by_device = {
+        record["device_id"]: record for record in records if record.get("device_id")
+    }
+
+    updated = await coordinators[entry.entry_id].async_apply_device_updates(records)
+    for coordinator in coordinators.values():
+        if coordinator.device_id and coordinator.device_id in by_device:
+            updated += await coordinator.async_apply_device_updates(
+                [by_device[coordinator.device_id]]
+            )
+
+    _LOGGER.debug("Gobzigh push: %d records, %d devices updated", len(records), updated)
+    return web.json_response({"received": len(records), "updated": updated})
@@ -0,0 +1,10 @@
+"""Fixtures for the Gobzigh unit tests."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+pytest_plugins = "pytest_homeassistant_custom_component"
@@ -0,0 +1,67 @@
+"""Tests of the consumption statistics import."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+
+from custom_components.gobzigh import consumption
+from custom_components.gobzigh.consumption import GobzighConsumptionStatistics
+
+
+@pytest.fixture
+def imported(monkeypatch: pytest.MonkeyPatch) -> List[Any]:
+    """Capture the statistic rows submitted to the recorder."""
+    rows: List[Any] = []
+    monkeypatch.setattr(
+        consumption,
+        "async_add_external_statistics",
+        lambda hass, metadata, statistics: rows.extend(statistics),
+    )
+    return rows
+
+
+def _importer() -> GobzighConsumptionStatistics:
+    """Return an importer with no previous sums in the recorder."""
+    hass = SimpleNamespace(config=SimpleNamespace(components={"recorder"}))
+    importer = GobzighConsumptionStatistics(hass)
+    importer._totals["tank"] = (0.0, 0.0)
+    return importer
+
+
+async def _import_at(
+    monkeypatch: pytest.MonkeyPatch,
+    importer: GobzighConsumptionStatistics,
+    now: datetime,
+    day_total: float,
+) -> None:
+    """Import one reading as if it arrived at ``now``."""
+    monkeypatch.setattr(consumption.dt_util, "utcnow", lambda: now)
+    monkeypatch.setattr(consumption.dt_util, "now", lambda time_zone=None: now)
+    await importer.async_import(
+        [{"device_id": "tank", "name": "Tank", "consumption": {"day": day_total}}]
+    )
+
+
+async def test_local_midnight_without_reset(
+    monkeypatch: pytest.MonkeyPatch, imported: List[Any]
+) -> None:
+    """A reading after local midnight that the API has not reset adds its delta."""
+    importer = _importer()
+    await _import_at(monkeypatch, importer, datetime(2026, 3, 1, 22, tzinfo=timezone.utc), 100)
+    await _import_at(monkeypatch, importer, datetime(2026, 3, 2, 1, tzinfo=timezone.utc), 120)
+
+    assert [row["sum"] for row in imported] == [100, 120]
+
+
+async def test_reset_starts_a_new_day(
+    monkeypatch: pytest.MonkeyPatch, imported: List[Any]
+) -> None:
+    """A drop in the day total adds the whole new total."""
+    importer = _importer()
+    await _import_at(monkeypatch, importer, datetime(2026, 3, 1, 22, tzinfo=timezone.utc), 100)
+    await _import_at(monkeypatch, importer, datetime(2026, 3, 2, 3, tzinfo=timezone.utc), 5)
+
+    assert [row["sum"] for row in imported] == [100, 105]
@@ -0,0 +1,52 @@
+"""Tests of the level history rollups and service."""
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+
+from custom_components.gobzigh.const import (
+    DOMAIN,
+    HISTORY_RESOLUTION_DAY,
+    HISTORY_RESOLUTION_HOUR,
+    SERVICE_HISTORY,
+)
+from custom_components.gobzigh.history import bucket_start
+from custom_components.gobzigh.services import async_setup_services
+
+
+@pytest.mark.parametrize(
+    ("local", "midnight"),
+    [
+        (datetime(2026, 6, 15, 0, 30), datetime(2026, 6, 15)),
+        (datetime(2026, 6, 15, 23, 59), datetime(2026, 6, 15)),
+        # The day after the spring DST change
+        (datetime(2026, 3, 30, 12, 0), datetime(2026, 3, 30)),
+    ],
+)
+async def test_day_buckets_start_at_local_midnight(
+    hass: HomeAssistant, local: datetime, midnight: datetime
+) -> None:
+    """Day rollups follow the local day, not UTC."""
+    hass.config.set_time_zone("Europe/Berlin")
+    zone = dt_util.DEFAULT_TIME_ZONE
+    timestamp = local.replace(tzinfo=zone).timestamp()
+
+    assert bucket_start(timestamp, HISTORY_RESOLUTION_DAY) == int(
+        midnight.replace(tzinfo=zone).timestamp()
+    )
+    assert bucket_start(timestamp, HISTORY_RESOLUTION_HOUR) == int(timestamp // 3600 * 3600)
+
+
+async def test_history_service_without_entries(hass: HomeAssistant) -> None:
+    """The service reports that no entry is loaded instead of opening a store."""
+    async_setup_services(hass)
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_HISTORY, {}, blocking=True, return_response=True
+        )
+    assert "gobzigh_history" not in hass.data
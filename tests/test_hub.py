@@ -0,0 +1,160 @@
+"""Tests of the shared request limiter and account poll schedule."""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.gobzigh import hub as hub_module
+from custom_components.gobzigh.const import (
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    PRIORITY_BACKGROUND,
+    PRIORITY_COMMAND,
+    PRIORITY_INTERACTIVE,
+)
+from custom_components.gobzigh.hub import GobzighHub, _PriorityLimiter
+
+
+async def _request(
+    limiter: _PriorityLimiter, priority: int, order: List[Any], tag: Any = None
+) -> None:
+    """Take a slot and note who it was granted to, by default the priority."""
+    async with limiter.acquire(priority):
+        order.append(priority if tag is None else tag)
+
+
+async def test_empty_bucket_serves_most_urgent_first() -> None:
+    """Queued requests get the next tokens by priority, not by arrival."""
+    limiter = _PriorityLimiter(4, rate=20, burst=1)
+    order: List[Any] = []
+    await _request(limiter, PRIORITY_BACKGROUND, order)
+
+    # The bucket is empty now, so all three queue up behind the next token
+    tasks = [
+        asyncio.create_task(_request(limiter, priority, order))
+        for priority in (PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, PRIORITY_COMMAND)
+    ]
+    await asyncio.sleep(0)
+    assert limiter.stats({})["queued"] == 3
+
+    await asyncio.wait_for(asyncio.gather(*tasks), 1)
+    assert order == [
+        PRIORITY_BACKGROUND,
+        PRIORITY_COMMAND,
+        PRIORITY_INTERACTIVE,
+        PRIORITY_BACKGROUND,
+    ]
+
+
+async def test_equal_priorities_keep_arrival_order() -> None:
+    """Waiters of the same priority are served first come, first served."""
+    limiter = _PriorityLimiter(1, rate=1000, burst=10)
+    order: List[Any] = []
+    async with limiter.acquire(PRIORITY_BACKGROUND):
+        tasks = [
+            asyncio.create_task(_request(limiter, PRIORITY_BACKGROUND, order, tag))
+            for tag in "abc"
+        ]
+        await asyncio.sleep(0)
+
+    await asyncio.wait_for(asyncio.gather(*tasks), 1)
+    assert order == ["a", "b", "c"]
+
+
+async def test_cancelled_while_queued() -> None:
+    """A waiter cancelled in the queue is skipped and takes no slot."""
+    limiter = _PriorityLimiter(1, rate=1000, burst=10)
+    order: List[Any] = []
+    async with limiter.acquire(PRIORITY_BACKGROUND):
+        cancelled = asyncio.create_task(_request(limiter, PRIORITY_COMMAND, order))
+        waiting = asyncio.create_task(_request(limiter, PRIORITY_BACKGROUND, order))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+
+    await asyncio.wait_for(waiting, 1)
+    assert order == [PRIORITY_BACKGROUND]
+    assert limiter.stats({})["in_flight"] == 0
+
+
+async def test_cancelled_while_slot_is_handed_over() -> None:
+    """A slot granted to a waiter that is cancelled before it runs is passed on."""
+    limiter = _PriorityLimiter(1, rate=1000, burst=10)
+    order: List[Any] = []
+    async with limiter.acquire(PRIORITY_BACKGROUND):
+        handed = asyncio.create_task(_request(limiter, PRIORITY_COMMAND, order))
+        await asyncio.sleep(0)
+    # Leaving the block granted the slot, but the waiter has not run yet
+    assert limiter.stats({})["in_flight"] == 1
+    handed.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await handed
+
+    assert order == []
+    assert limiter.stats({})["in_flight"] == 0
+    await asyncio.wait_for(_request(limiter, PRIORITY_BACKGROUND, order), 1)
+    assert order == [PRIORITY_BACKGROUND]
+
+
+async def test_rate_limits_requests_beyond_the_burst() -> None:
+    """Requests beyond the burst wait for tokens and are counted as delayed."""
+    limiter = _PriorityLimiter(4, rate=50, burst=2)
+    order: List[Any] = []
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await asyncio.wait_for(
+        asyncio.gather(*(_request(limiter, PRIORITY_BACKGROUND, order) for _ in range(4))), 1
+    )
+    # Two requests from the burst, two more at 50 tokens per second
+    assert loop.time() - started >= 0.03
+    stats = limiter.stats({PRIORITY_BACKGROUND: "background"})["priorities"]["background"]
+    assert stats["requests"] == 4
+    assert stats["delayed"] == 2
+
+
+class _Account:
+    """An account coordinator that counts its polls."""
+
+    def __init__(self, entry_id: str, scan_interval: float) -> None:
+        """Initialize the account."""
+        self.entry = SimpleNamespace(entry_id=entry_id)
+        self.user_id = entry_id
+        self.scan_interval = scan_interval
+        self.rate_limit = DEFAULT_RATE_LIMIT
+        self.rate_burst = DEFAULT_RATE_BURST
+        self.polls = 0
+
+    async def async_refresh(self) -> None:
+        """Count a poll."""
+        self.polls += 1
+
+
+async def test_accounts_keep_their_own_interval(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Interleaved accounts are each polled at their own scan interval."""
+    clock = [1000.0]
+    timers: List[float] = []
+    monkeypatch.setattr(hub_module.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(
+        hub_module,
+        "async_call_later",
+        lambda hass, delay, action: timers.append(delay) or (lambda: None),
+    )
+    hub = GobzighHub(hass)
+    fast, slow = _Account("fast", 30), _Account("slow", 600)
+    hub.async_register_account(fast)
+    hub.async_register_account(slow)
+
+    while clock[0] < 1000 + 1200:
+        clock[0] += timers[-1]
+        hub._async_tick(None)
+        await asyncio.sleep(0)
+
+    assert fast.polls == 40
+    assert slow.polls == 2
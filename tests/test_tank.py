@@ -0,0 +1,28 @@
+"""Tests of the per-device tank volume tables."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.gobzigh import tank as tank_module
+from custom_components.gobzigh.const import TANK_SHAPE_VERTICAL_CYLINDER
+from custom_components.gobzigh.tank import CompiledTank, TankShapeConfig
+
+
+def test_table_compiled_once_per_dimensions(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A tank's table is reused until its dimensions change."""
+    compiled = []
+    compile_volume_table = tank_module.compile_volume_table
+
+    def _compile(*args):
+        compiled.append(args[1:])
+        return compile_volume_table(*args)
+
+    monkeypatch.setattr(tank_module, "compile_volume_table", _compile)
+    tank = CompiledTank(TankShapeConfig(shape=TANK_SHAPE_VERTICAL_CYLINDER))
+
+    first = tank.table(2.0, 1.0, None)
+    assert tank.table(2.0, 1.0, None) is first
+    assert compiled == [(2.0, 1.0, None)]
+
+    assert tank.table(3.0, 1.0, None).max_volume > first.max_volume
+    assert compiled == [(2.0, 1.0, None), (3.0, 1.0, None)]
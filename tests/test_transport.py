@@ -0,0 +1,102 @@
+"""Tests of the streaming JSON array parser."""
+from __future__ import annotations
+
+import json
+from typing import Any, List
+
+import pytest
+
+from custom_components.gobzigh.transport import JsonArrayStream
+
+BODY = (
+    ' [ {"device_id": "a,b]", "name": "Tank \\"1\\" [roof]", "level": -4.5e3},'
+    ' {"nested": [1, [2, {"x": null}]], "ok": true},'
+    " 12, -0.25, 7E-2, \"\\u00e9\", false, null, [] ] "
+)
+
+
+def _parse(chunks: List[str]) -> Any:
+    """Feed the chunks one by one and return the decoded body."""
+    stream = JsonArrayStream()
+    items: List[Any] = []
+    for chunk in chunks:
+        items.extend(stream.feed(chunk))
+    return stream.result(items)
+
+
+def test_whole_body() -> None:
+    """A body fed at once decodes like json.loads."""
+    assert _parse([BODY]) == json.loads(BODY)
+
+
+@pytest.mark.parametrize("split", range(1, len(BODY)))
+def test_every_chunk_boundary(split: int) -> None:
+    """Splitting the body at any character gives the same elements."""
+    assert _parse([BODY[:split], BODY[split:]]) == json.loads(BODY)
+
+
+def test_single_character_chunks() -> None:
+    """Elements are decoded however finely the body is chunked."""
+    assert _parse(list(BODY)) == json.loads(BODY)
+
+
+@pytest.mark.parametrize(
+    "chunks",
+    [["[1", "2]"], ["[-4.", "5e3]"], ["[12", "3, 4", "5]"], ["[1.5", "e", "-2]"]],
+)
+def test_number_split_across_chunks(chunks: List[str]) -> None:
+    """A number is only emitted once the text after it shows it is complete."""
+    assert _parse(chunks) == json.loads("".join(chunks))
+
+
+def test_elements_emitted_as_they_complete() -> None:
+    """Each feed returns the elements its text completed, buffering the rest."""
+    stream = JsonArrayStream()
+    assert stream.feed('[{"a": 1}, {"b"') == [{"a": 1}]
+    assert stream.feed(': 2}, 3') == [{"b": 2}]
+    assert stream.feed("]") == [3]
+    assert stream.result([]) == []
+
+
+@pytest.mark.parametrize("body", ["[]", " [ ] ", "\n[\n]\n"])
+def test_empty_array(body: str) -> None:
+    """An empty array decodes to an empty list."""
+    assert _parse([body]) == []
+
+
+@pytest.mark.parametrize("body", ["[1] x", "[1][2]", '[1] {"a": 1}'])
+def test_trailing_data(body: str) -> None:
+    """Anything but whitespace after the array is rejected."""
+    with pytest.raises(ValueError):
+        _parse([body])
+
+
+@pytest.mark.parametrize("body", ["[1, 2", "[1,", "[", '[{"a": 1}'])
+def test_truncated_array(body: str) -> None:
+    """A body that ends inside the array is rejected."""
+    with pytest.raises(ValueError):
+        _parse([body])
+
+
+@pytest.mark.parametrize("body", ["[1 2]", "[1;2]", '[{"a": 1} {"b": 2}]'])
+def test_missing_separator(body: str) -> None:
+    """Elements must be separated by commas."""
+    with pytest.raises(ValueError):
+        _parse([body])
+
+
+@pytest.mark.parametrize(
+    "body", ['{"devices": [1, 2]}', ' "text" ', "42", "null", "true"]
+)
+def test_non_array_body(body: str) -> None:
+    """A body that is not an array is buffered and decoded whole."""
+    stream = JsonArrayStream()
+    assert stream.feed(body[:2]) == []
+    assert stream.feed(body[2:]) == []
+    assert stream.result([]) == json.loads(body)
+
+
+def test_invalid_non_array_body() -> None:
+    """A malformed body that is not an array fails to decode."""
+    with pytest.raises(ValueError):
+        _parse(['{"devices": '])
@@ -0,0 +1,95 @@
+"""Tests of the push webhook's signature checks."""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import time
+from types import SimpleNamespace
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.gobzigh.const import (
+    CONF_USER_ID,
+    CONF_WEBHOOK_ID,
+    CONF_WEBHOOK_SECRET,
+    DOMAIN,
+    WEBHOOK_SIGNATURE_HEADER,
+    WEBHOOK_TIMESTAMP_HEADER,
+)
+from custom_components.gobzigh.webhook import _async_handle_webhook
+
+WEBHOOK_ID = "gobzigh-test"
+SECRET = "s3cret"
+BODY = b'[{"device_id": "tank"}]'
+
+
+class _Request:
+    """A pushed request with fixed headers and body."""
+
+    def __init__(self, headers: dict) -> None:
+        """Initialize the request."""
+        self.headers = headers
+
+    async def read(self) -> bytes:
+        """Return the body."""
+        return BODY
+
+
+@pytest.fixture
+def entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Add an account entry whose webhook accepts signed pushes."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data={CONF_USER_ID: "507f1f77bcf86cd799439011", CONF_WEBHOOK_ID: WEBHOOK_ID},
+        options={CONF_WEBHOOK_SECRET: SECRET},
+    )
+    entry.add_to_hass(hass)
+
+    async def _apply(records):
+        return len(records)
+
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = SimpleNamespace(
+        device_id=None, async_apply_device_updates=_apply
+    )
+    return entry
+
+
+def _sign(timestamp: str) -> str:
+    """Return the signature of the body at a timestamp."""
+    return hmac.new(
+        SECRET.encode(), timestamp.encode() + b"." + BODY, hashlib.sha256
+    ).hexdigest()
+
+
+async def test_valid_signature(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """A correctly signed, recent push is accepted."""
+    timestamp = str(int(time.time()))
+    response = await _async_handle_webhook(
+        hass,
+        WEBHOOK_ID,
+        _Request({WEBHOOK_TIMESTAMP_HEADER: timestamp, WEBHOOK_SIGNATURE_HEADER: _sign(timestamp)}),
+    )
+    assert response.status == 200
+
+
+@pytest.mark.parametrize(
+    "signature", ["é" * 64, "not-a-digest", ""], ids=["non_ascii", "not_hex", "missing"]
+)
+async def test_invalid_signature(
+    hass: HomeAssistant, entry: MockConfigEntry, signature: str
+) -> None:
+    """A bad signature, including non-ASCII text, is rejected with 401."""
+    response = await _async_handle_webhook(
+        hass,
+        WEBHOOK_ID,
+        _Request(
+            {
+                WEBHOOK_TIMESTAMP_HEADER: str(int(time.time())),
+                WEBHOOK_SIGNATURE_HEADER: signature,
+            }
+        ),
+    )
+    assert response.status == 401
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Synthetic fleet generator for the Gobzigh integration.
+
+Expands EXAMPLE_DATA.EXAMPLE_DEVICE_LIST_RESPONSE into a fleet of any size
+and simulates it over a number of polls: tanks drain with a daily usage
+pattern, pumps refill them between the relay's on/off levels, readings carry
+ultrasonic jitter and devices occasionally drop offline. The result is a
+JSONL recording in the format written by the capture transport, so it can
+be replayed by the integration (transport "replay") or fed to benchmarks.
+
+Usage:
+    python tools/generate_fleet.py --devices 1000 --polls 288 -o fleet.jsonl
+"""
+
+import argparse
+import copy
+import importlib.util
+import json
+import math
+import random
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from EXAMPLE_DATA import EXAMPLE_DEVICE_LIST_RESPONSE, EXAMPLE_USER_ID  # noqa: E402
+
+ROOMS = ["Garden", "Storage", "Roof", "Basement", "Farm", "Pool", "Barn", "Well"]
+
+
+def load_const():
+    """Load the integration constants without importing Home Assistant."""
+    path = REPO_ROOT / "custom_components" / "gobzigh" / "const.py"
+    spec = importlib.util.spec_from_file_location("gobzigh_const", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class SimulatedTank:
+    """One device of the fleet and the state of its tank."""
+
+    def __init__(self, rng, index, user_id):
+        template = EXAMPLE_DEVICE_LIST_RESPONSE[index % len(EXAMPLE_DEVICE_LIST_RESPONSE)]
+        self.rng = rng
+        self.record = copy.deepcopy(template)
+        room = rng.choice(ROOMS)
+        settings = self.record["settings"]
+        settings.update(
+            {
+                "height": rng.randrange(80, 301, 10),
+                "width": rng.randrange(80, 401, 10),
+                "length": rng.randrange(80, 401, 10),
+                "s_dist": rng.randrange(20, 61, 5),
+                "o_relay": rng.randrange(10, 31, 5),
+                "c_relay": rng.randrange(70, 96, 5),
+                "has_relay": rng.random() < 0.7,
+            }
+        )
+        self.record.update(
+            {
+                "device_id": f"{rng.getrandbits(48):012x}",
+                "name": f"{room} Tank {index + 1}",
+                "room_name": room,
+                "user_id": user_id,
+                "loc_id": user_id,
+                "model_name": "WLSV0",
+                "relay_state": False,
+                "connection_status": True,
+                "consumption": {"day": 0, "week": 0, "month": 0},
+            }
+        )
+        self.level = rng.uniform(30, 90)  # % full
+        self.usage = rng.uniform(1.0, 8.0)  # % per hour at peak
+        self.fill = rng.uniform(15.0, 40.0)  # % per hour with the pump on
+        self.liters_per_pct = (
+            settings["height"] * settings["width"] * settings["length"] / 1000 / 100
+        )
+        self.consumed = {"day": 0.0, "week": 0.0, "month": 0.0}
+
+    def step(self, hours, clock_hour):
+        """Advance the simulation and return the device's list record."""
+        settings = self.record["settings"]
+
+        # Usage peaks during the day and almost stops at night
+        daytime = max(0.0, math.sin(math.pi * (clock_hour - 6) / 16)) if 6 <= clock_hour <= 22 else 0.0
+        drained = min(self.level, self.usage * (0.2 + daytime) * hours)
+        self.level -= drained
+        for period in self.consumed:
+            self.consumed[period] += drained * self.liters_per_pct
+
+        # The pump runs between the relay's on and off levels
+        relay = self.record["relay_state"]
+        if settings["has_relay"]:
+            if self.level <= settings["o_relay"]:
+                relay = True
+            elif self.level >= settings["c_relay"]:
+                relay = False
+        elif self.level < 15 and self.rng.random() < 0.1:
+            self.level = self.rng.uniform(80, 95)  # manual refill
+        if relay:
+            self.level = min(100.0, self.level + self.fill * hours)
+        self.record["relay_state"] = relay
+
+        # Occasional dropouts keep reporting the last reading
+        connected = self.rng.random() > 0.01
+        self.record["connection_status"] = connected
+        if connected:
+            water_height = settings["height"] * self.level / 100
+            jitter = self.rng.gauss(0, 0.7)
+            self.record["sensor_val"] = max(
+                0, round(settings["height"] + settings["s_dist"] - water_height + jitter)
+            )
+        self.record["consumption"] = {
+            period: round(total) for period, total in self.consumed.items()
+        }
+        return copy.deepcopy(self.record)
+
+    def reset(self, period):
+        """Start a new consumption period."""
+        self.consumed[period] = 0.0
+
+
+def main():
+    """Generate a synthetic fleet recording."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--devices", type=int, default=100, help="devices in the fleet")
+    parser.add_argument("--polls", type=int, default=288, help="account polls to simulate")
+    parser.add_argument("--interval", type=float, help="seconds between polls (default: scan interval)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed, same seed same fleet")
+    parser.add_argument("--user-id", default=EXAMPLE_USER_ID, help="account the fleet belongs to")
+    parser.add_argument("--start-hour", type=float, default=0.0, help="local hour of the first poll")
+    parser.add_argument("--details", action="store_true", help="also record per-device detail responses")
+    parser.add_argument("-o", "--output", default="fleet.jsonl", help="recording to write")
+    args = parser.parse_args()
+
+    const = load_const()
+    interval = args.interval or const.DEFAULT_SCAN_INTERVAL
+    rng = random.Random(args.seed)
+    tanks = [SimulatedTank(rng, index, args.user_id) for index in range(args.devices)]
+    list_url = f"{const.USER_DEVICE_LIST_URL}{args.user_id}"
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        for poll in range(args.polls):
+            elapsed = poll * interval
+            clock = args.start_hour + elapsed / 3600
+            if poll and int(clock // 24) != int((clock - interval / 3600) // 24):
+                day = int(clock // 24)
+                for tank in tanks:
+                    tank.reset("day")
+                    if day % 7 == 0:
+                        tank.reset("week")
+                    if day % 30 == 0:
+                        tank.reset("month")
+
+            devices = [tank.step(interval / 3600, clock % 24) for tank in tanks]
+            entry = {
+                "t": round(elapsed, 3),
+                "ms": round(rng.uniform(80, 400) + len(devices) * 0.05, 1),
+                "method": "GET",
+                "url": list_url,
+                "status": 200,
+                "body": devices,
+            }
+            file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            if args.details:
+                for device in devices:
+                    entry.update(
+                        url=f"{const.DEVICE_DETAIL_URL}{device['device_id']}",
+                        ms=round(rng.uniform(60, 250), 1),
+                        body=[device],
+                    )
+                    file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    print(f"Wrote {args.polls} polls of {args.devices} devices to {args.output}")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Memory footprint report for the Gobzigh integration's per-device state.
+
+Runs a real GobzighCoordinator in hub mode over synthetic fleets of
+increasing size, fed by a stub transport instead of the cloud, and polls it
+until every trend window is full. Each structure the coordinator and the
+shared hub keep per device is then measured: records and their index,
+metrics, trend windows, write gates, compiled tanks and write settings,
+shared attributes, device info, seeded hub cache entries, and the history
+and consumption bookkeeping. Objects shared between structures are counted
+once, in the first structure that holds them. The whole poll cycle is also
+measured with tracemalloc. Bytes per device should stay flat as the fleet
+grows.
+
+Needs Home Assistant and its test helpers:
+    pip install -r benchmarks/requirements.txt
+
+Usage:
+    python tools/memory_footprint.py --sizes 100 1000 10000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from types import FunctionType, MethodType, ModuleType
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / "tools"))
+
+from generate_fleet import SimulatedTank  # noqa: E402
+
+USER_ID = "507f1f77bcf86cd799439011"
+POLL_INTERVAL = 290.0
+
+# Objects that belong to Home Assistant or the interpreter, never to a device
+_OPAQUE = (type, ModuleType, FunctionType, MethodType)
+
+
+def deep_size(obj, seen):
+    """Return the bytes held by ``obj`` and everything it references, once each."""
+    if id(obj) in seen or isinstance(obj, _OPAQUE):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(key, seen) + deep_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in obj)
+    else:
+        if hasattr(obj, "__dict__"):
+            size += deep_size(vars(obj), seen)
+        for cls in type(obj).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if hasattr(obj, slot):
+                    size += deep_size(getattr(obj, slot), seen)
+    return size
+
+
+def build_transport(size):
+    """Return a transport that answers the account's list with a stepping fleet."""
+    from custom_components.gobzigh.const import USER_DEVICE_LIST_URL
+    from custom_components.gobzigh.transport import GobzighTransport
+
+    class FleetTransport(GobzighTransport):
+        """Answer each account list request with the fleet's next readings."""
+
+        def __init__(self):
+            """Initialize the fleet."""
+            rng = random.Random(0)
+            self._tanks = [SimulatedTank(rng, index, USER_ID) for index in range(size)]
+
+        async def async_request(self, method, url, payload=None):
+            """Return the next poll of the fleet."""
+            if url != f"{USER_DEVICE_LIST_URL}{USER_ID}":
+                return None
+            return [tank.step(POLL_INTERVAL / 3600, 12.0) for tank in self._tanks]
+
+    return FleetTransport()
+
+
+async def footprint(size, polls):
+    """Measure what a coordinator keeps for a fleet of ``size`` devices."""
+    from pytest_homeassistant_custom_component.common import (
+        MockConfigEntry,
+        async_test_home_assistant,
+    )
+
+    from custom_components.gobzigh.const import CONF_ADOPT_ALL, CONF_USER_ID, DOMAIN
+    from custom_components.gobzigh.coordinator import GobzighCoordinator
+
+    with tempfile.TemporaryDirectory() as storage_dir:
+        async with async_test_home_assistant(storage_dir=storage_dir) as hass:
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                version=2,
+                data={CONF_USER_ID: USER_ID},
+                options={CONF_ADOPT_ALL: True},
+            )
+            entry.add_to_hass(hass)
+            coordinator = GobzighCoordinator(hass, entry)
+            coordinator.transport = build_transport(size)
+            hub = coordinator.hub
+            hub.async_set_rate_limit(1e9, 1_000_000_000)
+
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            for _ in range(polls):
+                hub.async_clear_cache()
+                await coordinator.async_refresh()
+            await hass.async_block_till_done()
+            total = tracemalloc.get_traced_memory()[0] - before
+            tracemalloc.stop()
+
+            history = coordinator._history
+            consumption = coordinator._consumption
+            structures = {
+                "records": coordinator.data,
+                "device index": coordinator._positions,
+                "metrics": coordinator._metrics,
+                "trends": coordinator._trends,
+                "write gates": coordinator._level_gates,
+                "tanks and settings": (coordinator._tanks, coordinator._write_configs),
+                "attributes": coordinator._attributes,
+                "device info": coordinator._device_info,
+                "hub cache": hub._cache,
+                "history": (history._last_sample, history._pending),
+                "consumption": (consumption._totals, consumption._imported),
+            }
+            seen = set()
+            results = {name: deep_size(value, seen) for name, value in structures.items()}
+            results["poll cycle (tracemalloc)"] = total
+
+            await coordinator.async_shutdown()
+            await history.async_stop()
+            return results
+
+
+def main():
+    """Print the footprint report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--polls", type=int, default=16, help="polls, enough to fill the trends")
+    parser.add_argument("--json", action="store_true", help="print machine readable output")
+    args = parser.parse_args()
+
+    results = {size: asyncio.run(footprint(size, args.polls)) for size in args.sizes}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return True
+
+    structures = [
+        name for name in next(iter(results.values())) if name != "poll cycle (tracemalloc)"
+    ]
+    print("📦 Gobzigh memory footprint (bytes per device)")
+    print()
+    print(f"{'structure':<26}" + "".join(f"{size:>12}" for size in args.sizes))
+    for structure in structures + ["total", "poll cycle (tracemalloc)"]:
+        row = []
+        for size in args.sizes:
+            value = (
+                sum(results[size][name] for name in structures)
+                if structure == "total"
+                else results[size][structure]
+            )
+            row.append(f"{value / size:>12.0f}")
+        print(f"{structure:<26}" + "".join(row))
+
+    largest, smallest = max(args.sizes), min(args.sizes)
+    growth = (sum(results[largest][name] for name in structures) / largest) / (
+        sum(results[smallest][name] for name in structures) / smallest
+    )
+    print()
+    print(f"Per-device cost at {largest} devices is {growth:.2f}x that at {smallest}")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)